@@ -1,21 +1,43 @@
 # HR 5대 직무별 GPT 기반 Streamlit 데모 구현 코드 템플릿
 # 고급 기능 포함: PDF 저장, WordCloud, 감정분석, CSV/PDF 업로드, API Key 입력
 
+# 무거운 라이브러리(pdfkit, matplotlib, wordcloud, pandas, scikit-learn)는 해당 기능을 처음 쓸 때 import
 import streamlit as st
 import openai
 import os
-import pdfkit
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-from textblob import TextBlob
-import pandas as pd
-import PyPDF2
+import time
+from llm_cache import LLMCache, cached_chat, cached_chat_stream
+from asset_manager import korean_font_path
+from text_ingest import extract_one
 
 # GPT API Key 입력 (일회용)
 st.sidebar.title("🔐 GPT API Key 입력")
 api_key = st.sidebar.text_input("OpenAI API Key", type="password")
 client = openai.OpenAI(api_key=api_key)
 
+@st.cache_resource
+def get_llm_cache():
+    return LLMCache()
+
+llm_cache = get_llm_cache()
+
+# 설문 응답별 감정 점수 캐시 (항목 수가 많아 GPT 응답 캐시와 저장소/적중 통계를 분리)
+@st.cache_resource
+def get_survey_cache():
+    return LLMCache(root=".survey_cache", max_memory_items=20000)
+
+# GPT 호출 (동일 프롬프트는 캐시에서 즉시 반환)
+def ask_gpt(prompt, model="gpt-4o"):
+    return cached_chat(client, llm_cache, model, [{"role": "user", "content": prompt}])
+
+# GPT 스트리밍 호출 (토큰 도착 즉시 반환, timing에 첫 토큰 시간 기록)
+def ask_gpt_stream(prompt, model="gpt-4o", timing=None):
+    start = time.perf_counter()
+    for i, token in enumerate(cached_chat_stream(client, llm_cache, model, [{"role": "user", "content": prompt}])):
+        if i == 0 and timing is not None:
+            timing["ttft"] = time.perf_counter() - start
+        yield token
+
 ####################
 # 1. 채용: JD 기반 이력서 평가기
 ####################
@@ -26,12 +48,10 @@ def resume_evaluator():
     resume_text = ""
 
     if resume:
-        if resume.type == "application/pdf":
-            reader = PyPDF2.PdfReader(resume)
-            for page in reader.pages:
-                resume_text += page.extract_text()
-        else:
-            resume_text = resume.read().decode("utf-8")
+        resume_text = extract_one(resume.name, resume.getvalue())["text"]
+
+    if st.session_state.get("cancel_eval"):
+        st.warning("⏹️ 이력서 평가 생성을 중단했습니다.")
 
     if st.button("이력서 평가하기") and jd and resume_text:
         prompt = f"""
@@ -42,13 +62,14 @@ def resume_evaluator():
         이력서:
         {resume_text}
         """
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        result = response.choices[0].message.content
-        st.markdown(result)
+        # 중단 버튼을 누르면 스크립트가 다시 실행되며 진행 중인 스트림이 닫힌다
+        st.button("⏹️ 생성 중단", key="cancel_eval")
+        timing = {}
+        start = time.perf_counter()
+        result = st.write_stream(ask_gpt_stream(prompt, timing=timing))
+        st.caption(f"⏱️ 첫 토큰 {timing.get('ttft', 0):.2f}초 · 전체 {time.perf_counter() - start:.1f}초")
         if st.download_button("📥 평가결과 PDF 다운로드", data=result, file_name="resume_result.pdf"):
+            import pdfkit
             pdfkit.from_string(result, "resume_result.pdf")
 
 ####################
@@ -62,11 +83,7 @@ def learning_recommender():
 
     if st.button("학습 로드맵 추천"):
         prompt = f"직무: {job}, 수준: {level}, 집중역량: {focus}에 맞춘 학습 경로를 단계별로 설계해줘"
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        st.markdown(response.choices[0].message.content)
+        st.write_stream(ask_gpt_stream(prompt))
 
 ####################
 # 3. 평가: 피드백 문장 생성기
@@ -78,11 +95,7 @@ def performance_feedback():
 
     if st.button("피드백 문장 생성"):
         prompt = f"항목: {', '.join(trait)}\n사례: {example}\n공감 피드백 작성"
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        st.markdown(response.choices[0].message.content)
+        st.write_stream(ask_gpt_stream(prompt))
 
 ####################
 # 4. 보상: 보상 제안 생성기
@@ -95,37 +108,104 @@ def compensation_planner():
 
     if st.button("보상 제안 생성"):
         prompt = f"직무: {role}, 경력: {exp}, 지역: {region}에 적절한 보상안 제안"
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        st.markdown(response.choices[0].message.content)
+        st.write_stream(ask_gpt_stream(prompt))
 
 ####################
 # 5. 조직문화: 설문 요약 + 감정분석 + 워드클라우드
 ####################
 def culture_survey_analyzer():
     st.header("5. 조직문화 - 설문 분석기")
+    mode = st.radio("입력 방식", ["텍스트 입력", "파일 업로드 (응답 단위)"], horizontal=True)
+    if mode == "파일 업로드 (응답 단위)":
+        survey_file_analyzer()
+        return
+
     survey = st.text_area("📄 사내 설문/의견 텍스트 입력")
     analysis_type = st.radio("분석 유형", ["요약", "감정분석", "워드클라우드"])
 
     if st.button("설문 분석 실행"):
         if analysis_type == "요약":
             prompt = f"다음 내용을 요약해줘:\n{survey}"
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}]
-            )
-            st.markdown(response.choices[0].message.content)
+            st.write_stream(ask_gpt_stream(prompt))
         elif analysis_type == "감정분석":
-            blob = TextBlob(survey)
-            st.write(f"긍정도 점수: {blob.sentiment.polarity:.2f}")
+            # 줄 단위 응답별로 점수를 매겨 평균 (한국어 응답은 TextBlob으로 점수가 나오지 않음)
+            from survey_engine import score_sentiment
+            lines = [line for line in survey.splitlines() if line.strip()]
+            if lines:
+                scores, _, fallback = score_sentiment(lines, ask_gpt, get_survey_cache())
+                st.write(f"긍정도 점수: {scores.mean():.2f} (응답 {len(lines)}건 평균)")
+                if fallback:
+                    st.warning(f"GPT 배치 실패로 {fallback:,}건은 사전 기반 점수(척도가 다름)로 대체했습니다.")
         elif analysis_type == "워드클라우드":
-            wc = WordCloud(font_path=None, width=600, height=400).generate(survey)
+            import matplotlib.pyplot as plt
+            from wordcloud import WordCloud
+            wc = WordCloud(font_path=korean_font_path(), width=600, height=400).generate(survey)
             plt.imshow(wc, interpolation='bilinear')
             plt.axis("off")
             st.pyplot(plt)
 
+# 응답 1행 = 1건 파일 분석: 응답별 감정 점수(신규 응답만 GPT 배치 처리) + 부서/문항별 집계 + 키워드 빈도
+def survey_file_analyzer():
+    survey_file = st.file_uploader("설문 응답 파일 (CSV: 응답 1행 1건 / TXT: 1줄 1건)", type=["csv", "txt"])
+    if not survey_file:
+        return
+    import pandas as pd
+    from survey_engine import score_sentiment, keyword_frequencies, group_summary
+
+    if survey_file.name.lower().endswith(".txt"):
+        lines = survey_file.getvalue().decode("utf-8", errors="ignore").splitlines()
+        df = pd.DataFrame({"응답": [line.strip() for line in lines if line.strip()]})
+    else:
+        df = pd.read_csv(survey_file)
+    st.caption(f"응답 {len(df):,}건")
+
+    columns = list(df.columns)
+    text_col = st.selectbox("응답 텍스트 컬럼", columns, index=columns.index("응답") if "응답" in columns else 0)
+    group_cols = st.multiselect("집계 기준 (부서, 문항 등)", [c for c in columns if c != text_col])
+    method = st.radio("감정 점수 방식", ["GPT 배치 (응답별 캐시)", "사전 기반 (빠름, API 미사용)"], horizontal=True)
+
+    if st.button("설문 분석 실행", key="survey_file_run"):
+        progress = st.progress(0)
+        scores, fresh, fallback = score_sentiment(
+            df[text_col].tolist(),
+            ask=ask_gpt if method.startswith("GPT") else None,
+            cache=get_survey_cache() if method.startswith("GPT") else None,
+            on_progress=lambda done, total: progress.progress(done / total),
+        )
+        progress.progress(1.0)
+        df["감정 점수"] = scores
+        if fresh or fallback:
+            st.caption(f"신규 응답 {fresh:,}건만 처리하고 나머지는 캐시를 재사용했습니다")
+        else:
+            st.caption("모든 응답을 캐시에서 불러왔습니다")
+        if fallback:
+            st.warning(f"GPT 배치 실패로 {fallback:,}건은 사전 기반 점수(척도가 다름)로 대체했습니다. 다시 실행하면 이 응답들만 재요청합니다.")
+        st.metric("평균 감정 점수", f"{scores.mean():.2f}")
+
+        for col in group_cols:
+            st.subheader(f"📊 {col}별 감정")
+            summary = group_summary(df, col)
+            st.dataframe(summary)
+            st.bar_chart(summary["평균 감정"])
+
+        overall, by_group = keyword_frequencies(df, text_col, group_cols, top_n=50)
+        if not overall.empty:
+            import matplotlib.pyplot as plt
+            from wordcloud import WordCloud
+            st.subheader("🔑 주요 키워드")
+            wc = WordCloud(font_path=korean_font_path(), width=600, height=400, background_color="white").generate_from_frequencies(overall.to_dict())
+            fig, ax = plt.subplots()
+            ax.imshow(wc, interpolation='bilinear')
+            ax.axis("off")
+            st.pyplot(fig)
+            plt.close(fig)
+            for col, table in by_group.items():
+                st.markdown(f"**{col}별 상위 키워드**")
+                st.dataframe(table.head(15), hide_index=True)
+
+        st.dataframe(df, hide_index=True)
+        st.download_button("📥 응답별 결과 CSV", df.to_csv(index=False).encode("utf-8-sig"), file_name="survey_sentiment.csv")
+
 ####################
 # 6. CSV 기반 GPT 분석 (예: 교육 요청서)
 ####################
@@ -133,15 +213,20 @@ def csv_analyzer():
     st.header("6. CSV 기반 분석기 (예: 교육 요청서)")
     csv_file = st.file_uploader("CSV 업로드", type="csv")
     if csv_file:
+        import pandas as pd
+        from csv_summarizer import summarize_csv
+
         df = pd.read_csv(csv_file)
         st.write("업로드된 데이터:", df.head())
         if st.button("GPT 요약 생성"):
-            prompt = f"다음 데이터로 인사이트 요약해줘:\n{df.to_string()}"
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}]
-            )
-            st.markdown(response.choices[0].message.content)
+            # 전체 집계 + 청크별 병렬 요약 후 병합 (원본 행 전체를 한 프롬프트에 넣지 않음)
+            progress = st.progress(0)
+            summary = summarize_csv(df, ask_gpt, on_progress=lambda done, total: progress.progress(done / total))
+            with st.expander(f"📊 데이터 집계 및 부분 요약 ({summary['chunks']}개 청크{', 표본 추출' if summary['sampled'] else ''})"):
+                st.text(summary["profile"])
+                for i, part in enumerate(summary["partials"], 1):
+                    st.markdown(f"**청크 {i}**\n\n{part}")
+            st.markdown(summary["summary"])
 
 ####################
 # 메인 실행
@@ -150,6 +235,9 @@ def main():
     st.set_page_config(page_title="HR AI Toolkit", layout="wide")
     st.title("💼 HR AI Toolkit - GPT 기반 인사 자동화 도구")
 
+    stats = llm_cache.stats()
+    st.sidebar.caption(f"🗄️ GPT 캐시 적중 {stats['hits_memory'] + stats['hits_disk']} / 미적중 {stats['misses']}")
+
     menu = st.sidebar.radio("기능 선택", ["1. 채용", "2. 교육", "3. 평가", "4. 보상", "5. 조직문화", "6. CSV 분석"])
     if menu == "1. 채용":
         resume_evaluator()
@@ -1,18 +1,14 @@
+# 시각화/ML 라이브러리(pandas, matplotlib, seaborn, sklearn, plotly)는 리포트를 그릴 때 처음 import
 import streamlit as st
 import openai
-import PyPDF2
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import seaborn as sns
-import json
-import base64
-import numpy as np
-from io import BytesIO
-from sklearn.preprocessing import MinMaxScaler
-import os, requests
+from asset_manager import render_wordcloud, FontNotFoundError
+from text_ingest import extract_many
+from gpt_scheduler import run_bounded, TokenBudget
+from llm_cache import LLMCache
+from structured_output import ParseStats
+from candidate_analysis import analyze_resume, request_tokens
+from stage_metrics import MetricsRecorder, render_sidebar
+from report_builder import AssetStore, fig_png, candidate_section, summary_section, render_page, peak_rss_mb
 
 # 📌 기본 설정
 st.set_page_config(page_title="채용 적합도 분석기", layout="wide")
@@ -21,10 +17,31 @@ st.title("✨ GPT 기반 채용 적합도 분석기")
 # 🔐 GPT API 입력
 st.sidebar.title("🔐 GPT API Key")
 api_key = st.sidebar.text_input("OpenAI API Key 입력", type="password")
+base_url = st.sidebar.text_input("OpenAI 호환 Base URL (선택)", help="로컬 목 서버 등 OpenAI 호환 엔드포인트 주소")
 if not api_key:
     st.warning("🔑 API Key를 입력해주세요.")
     st.stop()
-client = openai.OpenAI(api_key=api_key)
+client = openai.OpenAI(api_key=api_key, base_url=base_url or None)
+
+@st.cache_resource
+def get_llm_cache():
+    return LLMCache()
+
+llm_cache = get_llm_cache()
+
+# ⏱️ 단계별 계측 (세션 단위)
+if "metrics" not in st.session_state:
+    st.session_state.metrics = MetricsRecorder()
+metrics = st.session_state.metrics
+if "parse_stats" not in st.session_state:
+    st.session_state.parse_stats = ParseStats()
+parse_stats = st.session_state.parse_stats
+REPORT_STAGES = ["wordcloud", "radar_chart", "summary_charts", "report_html"]
+
+# ⚙️ 병렬 분석 설정
+st.sidebar.subheader("⚙️ 분석 실행 설정")
+max_workers = st.sidebar.slider("동시 분석 개수", 1, 16, 4)
+tokens_per_minute = st.sidebar.number_input("분당 토큰 예산 (TPM)", min_value=1000, value=30000, step=1000)
 
 # 📌 JD + 가중치 입력
 st.sidebar.subheader("📌 JD 입력")
@@ -40,155 +57,157 @@ weights = {
 # 📄 자기소개서 업로드
 uploaded_files = st.file_uploader("📄 자기소개서 업로드 (PDF 또는 TXT)", type=["pdf", "txt"], accept_multiple_files=True)
 
-def extract_text(file):
-    if file.type == "application/pdf":
-        reader = PyPDF2.PdfReader(file)
-        return "\n".join([page.extract_text() for page in reader.pages])
-    return file.read().decode("utf-8")
+# 🖼️ 리포트 이미지는 내용 해시 URL의 정적 에셋으로 제공 (정적 서빙이 꺼져 있으면 data URI)
+@st.cache_resource
+def get_asset_store():
+    return AssetStore(inline=not st.get_option("server.enableStaticServing"))
 
-def to_base64(fig):
-    buf = BytesIO()
-    fig.savefig(buf, format="png", bbox_inches='tight')
-    return base64.b64encode(buf.getvalue()).decode()
+assets = get_asset_store()
 
-# ✅ WordCloud (한글 폰트 자동 다운로드 포함)
+# ✅ WordCloud (한글 폰트는 프로세스당 1회 확보, 같은 키워드 집합은 캐시된 PNG 사용)
 def generate_wordcloud(text):
-    font_path = "/tmp/NanumGothic.ttf"
-    font_url = "https://github.com/naver/nanumfont/releases/download/VER2.5/NanumGothic.ttf"
-
-    if os.path.exists(font_path):
-        try:
-            os.remove(font_path)
-        except:
-            pass
-
-    try:
-        response = requests.get(font_url)
-        response.raise_for_status()
-        with open(font_path, "wb") as f:
-            f.write(response.content)
-    except Exception as e:
-        raise RuntimeError(f"폰트 다운로드 실패: {e}")
-
     try:
-        wc = WordCloud(font_path=font_path, background_color="white", width=600, height=300).generate(text)
-        fig, ax = plt.subplots()
-        ax.imshow(wc, interpolation="bilinear")
-        ax.axis("off")
-        buf = BytesIO()
-        plt.savefig(buf, format="png", bbox_inches='tight')
-        plt.close()
-        return base64.b64encode(buf.getvalue()).decode()
+        return render_wordcloud(text, width=600, height=300)
+    except FontNotFoundError:
+        raise
     except Exception as e:
         raise RuntimeError(f"WordCloud 생성 실패: {e}")
 
-# ✅ Radar Chart
-def generate_radar_chart(labels, values):
-    fig = go.Figure()
-    fig.add_trace(go.Scatterpolar(r=values, theta=labels, fill='toself'))
-    fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 5])), showlegend=False)
-    buf = BytesIO()
-    fig.write_image(buf, format="png", width=500, height=400)
-    return base64.b64encode(buf.getvalue()).decode()
-
-# ✅ 종합 시각화
-def generate_summary_charts(results):
-    names = [r["파일명"] for r in results]
-    scores = [r["전반적 적합도 점수"] for r in results]
-    strengths = [len(r["강점"]) for r in results]
-    weaknesses = [len(r["우려사항"]) for r in results]
-
-    df = pd.DataFrame({
-        "파일명": names,
-        "적합도": scores,
-        "강점": strengths,
-        "우려사항": weaknesses
-    }).set_index("파일명")
+# ✅ Radar Chart (상주 렌더러 풀에서 병렬 렌더링, 같은 라벨/값은 재사용)
+@st.cache_resource
+def get_chart_renderer():
+    from chart_renderer import ChartRenderer
+    return ChartRenderer(workers=4)
+
+def radar_inputs(r):
+    from fit_scoring import comment_score
+    labels = list(r["역량별 평가 코멘트"].keys())
+    values = [comment_score(v) for v in r["역량별 평가 코멘트"].values()]
+    return labels, values
+
+def generate_radar_charts(results):
+    renderer = get_chart_renderer()
+    return renderer.radars([radar_inputs(r) for r in results])
+
+# ✅ 종합 시각화 (가중 점수 반영)
+def generate_summary_charts(results, ranked):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.preprocessing import MinMaxScaler
+    from fit_scoring import comment_score
+
+    df = ranked.set_index("파일명")[["적합도", "강점", "우려사항", "가중 점수"]]
     normed = MinMaxScaler().fit_transform(df)
     fig1, ax1 = plt.subplots()
-    sns.heatmap(normed, annot=df.values, fmt=".0f", cmap="YlGnBu", xticklabels=df.columns, yticklabels=names, ax=ax1)
-    heatmap_b64 = to_base64(fig1)
+    sns.heatmap(normed, annot=df.values, fmt=".0f", cmap="YlGnBu", xticklabels=df.columns, yticklabels=df.index, ax=ax1)
+    heatmap_png = fig_png(fig1)
 
     all_scores = {}
     for r in results:
         for k, v in r["역량별 평가 코멘트"].items():
-            score = 5 if "우수" in v or "높음" in v else 3 if "보통" in v else 1
-            all_scores[k] = all_scores.get(k, 0) + score
+            all_scores[k] = all_scores.get(k, 0) + comment_score(v)
     avg_scores = {k: round(v / len(results), 2) for k, v in all_scores.items()}
     fig2, ax2 = plt.subplots()
     sns.barplot(x=list(avg_scores.keys()), y=list(avg_scores.values()), ax=ax2)
-    avg_b64 = to_base64(fig2)
-
-    return heatmap_b64, avg_b64
-
-# ✅ GPT 분석 실행
-results = []
+    avg_png = fig_png(fig2)
+
+    return heatmap_png, avg_png
+
+def analyze(doc, budget):
+    name, text = doc
+    with metrics.stage("gpt", name) as span:
+        parsed = analyze_resume(client, llm_cache, jd_input, text, on_usage=span.usage, stats=parse_stats,
+                                before_call=lambda messages: budget.acquire(request_tokens(messages)))
+    parsed["파일명"] = name
+    return parsed
+
+# ✅ GPT 분석 실행 (동시성 + 토큰 예산 제한, 완료되는 대로 표시)
+# 토큰 예산은 캐시 미적중으로 실제 API를 호출할 때만 차감하므로, 캐시된 재분석은 대기 없이 바로 끝난다
+# 분석 결과는 세션에 보관하므로 가중치 슬라이더를 움직여도 다시 호출하지 않는다
+if "results" not in st.session_state:
+    st.session_state.results = []
+    st.session_state.features = None
 if st.button("📊 적합도 분석 실행") and uploaded_files and jd_input:
-    for file in uploaded_files:
-        text = extract_text(file)
-        prompt = f"""
-        JD 또는 기대사항: {jd_input}
-
-        자기소개서:
-        {text}
-
-        다음 항목에 대해 JSON 형식으로 분석해줘:
-        {{
-        "핵심 경험과 키워드": [...],
-        "전반적 적합도 점수": 0~100 정수,
-        "강점": [...],
-        "우려사항": [...],
-        "종합 의견 요약": "...",
-        "추천 여부": "...",
-        "미래 잠재역량 또는 성장 가능성": "...",
-        "역량별 평가 코멘트": {{
-            "문제 해결력": "...",
-            "데이터 활용력": "...",
-            "협업/커뮤니케이션": "...",
-            "학습 및 성장의지": "..."
-        }}
-        }}
-        """
-        try:
-            res = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}]
-            )
-            content = res.choices[0].message.content
-            parsed = json.loads(content[content.find("{"):content.rfind("}") + 1])
-            parsed["파일명"] = file.name
-            results.append(parsed)
-        except Exception as e:
-            st.error(f"{file.name} 분석 실패: {e}")
+    import pandas as pd
+    from fit_scoring import build_features
+
+    metrics.reset()
+    extracted = extract_many([(file.name, file.getvalue()) for file in uploaded_files])
+    for e in extracted:
+        metrics.record("extract", e["name"], e["seconds"])
+    with st.expander("📄 텍스트 추출 결과"):
+        st.dataframe(pd.DataFrame(extracted)[["name", "pages", "seconds", "cached"]])
+    docs = [(e["name"], e["text"]) for e in extracted]
+    progress = st.progress(0)
+    finished = {}
+    budget = TokenBudget(tokens_per_minute)
+    for done, (i, parsed, err) in enumerate(run_bounded(
+        docs, lambda doc: analyze(doc, budget), max_workers=max_workers,
+    ), 1):
+        if err:
+            st.error(f"{docs[i][0]} 분석 실패: {err}")
+        else:
+            finished[i] = parsed
+            st.write(f"✔️ {docs[i][0]} — 적합도 {parsed.get('전반적 적합도 점수')}")
+        progress.progress(done / len(docs))
+    st.session_state.results = [finished[i] for i in sorted(finished)]
+    st.session_state.features = build_features(st.session_state.results) if finished else None
+    stats = llm_cache.stats()
+    st.sidebar.caption(f"🗄️ GPT 캐시 적중 {stats['hits_memory'] + stats['hits_disk']} / 미적중 {stats['misses']}")
+    parsing = parse_stats.stats()
+    st.sidebar.caption(f"🧩 JSON 파싱 성공률 {parsing['parse_success']:.0%} (로컬 복구 {parsing['repaired']} / 재질의 {parsing['requeried']} / 실패 {parsing['failed']})")
 
 # ✅ HTML 보고서 렌더링
+results = st.session_state.results
 if results:
     st.success("✅ 분석 완료")
+    from fit_scoring import rank_candidates
+
+    ranked = rank_candidates(st.session_state.features, weights)
+    st.markdown("## 🏆 가중치 반영 순위")
+    st.dataframe(ranked, hide_index=True)
     st.markdown("## 📑 분석 리포트 (PDF 저장 가능)")
 
-    html = "<html><body><h1>채용 적합도 분석 리포트</h1>"
-    for r in results:
-        radar_labels = list(r["역량별 평가 코멘트"].keys())
-        radar_values = [5 if "우수" in v or "높음" in v else 3 if "보통" in v else 1 for v in r["역량별 평가 코멘트"].values()]
-        wordcloud_b64 = generate_wordcloud(" ".join(r["핵심 경험과 키워드"]))
-        radar_b64 = generate_radar_chart(radar_labels, radar_values)
-
-        html += f"<h2>{r['파일명']}</h2>"
-        html += f"<p><b>적합도 점수:</b> {r['전반적 적합도 점수']} | <b>추천:</b> {r['추천 여부']}</p>"
-        html += f"<p><b>미래 잠재역량:</b> {r['미래 잠재역량 또는 성장 가능성']}</p>"
-        html += "<h4>📌 핵심 경험 및 키워드</h4><ul>" + "".join(f"<li>{kw}</li>" for kw in r["핵심 경험과 키워드"]) + "</ul>"
-        html += f"<img src='data:image/png;base64,{wordcloud_b64}' width='600'/>"
-        html += "<h4>💪 강점</h4><ul>" + "".join(f"<li>{s}</li>" for s in r["강점"]) + "</ul>"
-        html += "<h4>⚠️ 우려사항</h4><ul>" + "".join(f"<li>{w}</li>" for w in r["우려사항"]) + "</ul>"
-        html += "<h4>🧠 역량별 평가</h4><ul>" + "".join(f"<li><b>{k}</b>: {v}</li>" for k, v in r["역량별 평가 코멘트"].items()) + "</ul>"
-        html += f"<img src='data:image/png;base64,{radar_b64}' width='500'/>"
-        html += f"<h4>📝 종합 의견</h4><p>{r['종합 의견 요약']}</p><hr>"
-
-    heatmap_b64, avg_b64 = generate_summary_charts(results)
-    html += "<h2>📊 전체 지원자 종합 분석</h2>"
-    html += f"<h4>지원자별 지표 히트맵</h4><img src='data:image/png;base64,{heatmap_b64}' width='700'/>"
-    html += f"<h4>역량 평균 점수</h4><img src='data:image/png;base64,{avg_b64}' width='600'/>"
-    html += "</body></html>"
+    # 현재 페이지의 후보자만 차트를 그리고, 이미지는 URL로 참조해 페이로드를 작게 유지
+    col1, col2 = st.columns(2)
+    page_size = col1.selectbox("페이지당 지원자 수", [5, 10, 20, 50], index=1)
+    pages = (len(results) + page_size - 1) // page_size
+    page = col2.number_input(f"페이지 (총 {pages})", min_value=1, max_value=pages, value=1)
+    page_results = results[(page - 1) * page_size:page * page_size]
+
+    metrics.reset(REPORT_STAGES)
+    with metrics.stage("radar_chart"):
+        radar_charts = generate_radar_charts(page_results)
+    sections = []
+    font_error = None
+    for r, radar_png in zip(page_results, radar_charts):
+        # 키워드가 비어 있으면(GPT가 빈 목록을 주거나 기본값으로 채워진 경우) 워드클라우드는 생략
+        keywords = " ".join(r["핵심 경험과 키워드"]).strip()
+        wordcloud_url = None
+        if keywords and not font_error:
+            try:
+                with metrics.stage("wordcloud", r["파일명"]):
+                    wordcloud_url = assets.put(generate_wordcloud(keywords))
+            except FontNotFoundError as e:
+                # 한글 폰트가 없으면 깨진 이미지 대신 워드클라우드를 모두 생략하고 한 번만 안내
+                font_error = e
+                st.warning(f"🔤 {e}")
+        note = "한글 폰트가 없어 워드클라우드를 생략했습니다." if keywords and font_error else "키워드가 없어 워드클라우드를 생략했습니다."
+        sections.append(candidate_section(r, wordcloud_url, assets.put(radar_png), note))
+
+    if page == pages:
+        with metrics.stage("summary_charts"):
+            heatmap_png, avg_png = generate_summary_charts(results, ranked)
+        sections.append(summary_section(assets.put(heatmap_png), assets.put(avg_png)))
+
+    with metrics.stage("report_html"):
+        html = render_page(f"채용 적합도 분석 리포트 ({page}/{pages})", sections)
 
     st.components.v1.html(html, height=2400, scrolling=True)
+    rss = peak_rss_mb()
+    st.caption(f"📦 리포트 페이로드 {len(html.encode('utf-8')) / 1024:,.1f} KB"
+               + (" (이미지 인라인)" if assets.inline else " (이미지는 캐시 가능한 정적 에셋)")
+               + (f" · 최대 RSS {rss:,.0f} MB" if rss else ""))
     st.info("💾 PDF 저장: 브라우저에서 Ctrl+P 또는 ⌘+P를 눌러 'PDF로 저장'")
+
+render_sidebar(metrics)
@@ -0,0 +1,102 @@
+# 폰트/이미지 에셋 관리
+# 한글 폰트는 찾은 경로만 프로세스당 한 번 기억하고(HR_KOREAN_FONT → 번들 → 시스템 → 로컬 캐시 → 다운로드),
+# 찾지 못하면 한글이 네모로 깨진 이미지를 만들지 않도록 안내 메시지와 함께 실패한다.
+# 워드클라우드는 같은 키워드 집합 + 크기 조합이면 저장된 PNG를 그대로 돌려준다.
+
+import functools
+import hashlib
+import os
+import threading
+import time
+from io import BytesIO
+
+FONT_URL = "https://github.com/naver/nanumfont/releases/download/VER2.5/NanumGothic.ttf"
+CACHE_DIR = os.environ.get("HR_ASSET_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "hr_test"))
+FONT_CANDIDATES = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "fonts", "NanumGothic.ttf"),
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    "/Library/Fonts/NanumGothic.ttf",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgun.ttf",
+    os.path.join(CACHE_DIR, "NanumGothic.ttf"),
+]
+
+# 다운로드 실패 후 재시도까지 기다리는 시간 (오프라인에서 워드클라우드마다 10초씩 막히지 않게)
+FONT_RETRY_SECONDS = 300
+
+_font_lock = threading.Lock()
+_font_retry_at = 0.0
+
+
+class FontNotFoundError(RuntimeError):
+    pass
+
+
+# ✅ 한글 폰트 경로 (찾은 경로만 캐시, 찾지 못하면 FontNotFoundError → 다음 호출에서 다시 탐색)
+@functools.lru_cache(maxsize=1)
+def korean_font_path():
+    global _font_retry_at
+
+    env_path = os.environ.get("HR_KOREAN_FONT")
+    if env_path and not os.path.exists(env_path):
+        raise FontNotFoundError(f"HR_KOREAN_FONT 경로에 폰트 파일이 없습니다: {env_path}")
+    for path in [env_path] + FONT_CANDIDATES:
+        if path and os.path.exists(path):
+            return path
+    with _font_lock:
+        error = None
+        if time.monotonic() >= _font_retry_at:
+            try:
+                return _download_font(os.path.join(CACHE_DIR, "NanumGothic.ttf"))
+            except Exception as e:
+                _font_retry_at = time.monotonic() + FONT_RETRY_SECONDS
+                error = e
+        raise FontNotFoundError(
+            "한글 폰트를 찾지 못했습니다. NanumGothic 등 한글 TTF 경로를 HR_KOREAN_FONT 환경 변수로 지정하거나 "
+            "assets/fonts/NanumGothic.ttf에 두세요" + (f" (다운로드 실패: {error})" if error else "")
+        )
+
+
+def _download_font(path):
+    import requests
+
+    response = requests.get(FONT_URL, timeout=10)
+    response.raise_for_status()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(response.content)
+    os.replace(tmp, path)
+    return path
+
+
+def _wordcloud_key(text, width, height, background_color, font_path):
+    words = " ".join(sorted(text.split()))
+    raw = f"{width}x{height}\x00{background_color}\x00{font_path}\x00{words}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ✅ 워드클라우드 PNG (메모리 LRU + 디스크 캐시)
+@functools.lru_cache(maxsize=512)
+def render_wordcloud(text, width=600, height=300, background_color="white"):
+    font_path = korean_font_path()
+    key = _wordcloud_key(text, width, height, background_color, font_path)
+    path = os.path.join(CACHE_DIR, "wordclouds", f"{key}.png")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    from wordcloud import WordCloud
+
+    wc = WordCloud(font_path=font_path, background_color=background_color, width=width, height=height, random_state=42).generate(text)
+    buf = BytesIO()
+    wc.to_image().save(buf, format="PNG")
+    png = buf.getvalue()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(png)
+    os.replace(tmp, path)
+    return png
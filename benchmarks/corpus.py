@@ -0,0 +1,43 @@
+# 합성 이력서/JD 코퍼스
+# 시드가 고정되어 있어 같은 크기를 요청하면 항상 같은 데이터가 만들어진다.
+
+import random
+
+SKILLS = ["Python", "SQL", "Tableau", "Excel", "Spark", "머신러닝", "데이터 시각화", "A/B 테스트",
+          "채용 운영", "HRBP", "성과 관리", "보상 설계", "교육 기획", "노무 관리", "조직문화", "프로젝트 관리"]
+ROLES = ["데이터 분석가", "HR 매니저", "인사 기획 담당자", "교육 담당자", "보상 담당자", "채용 담당자"]
+COMPANIES = ["가나전자", "다라소프트", "마바물산", "사아금융", "자차게임즈", "카타바이오"]
+SENTENCES = [
+    "{company}에서 {years}년간 {role}로 근무하며 {skill} 기반 업무를 주도했습니다.",
+    "{skill}을 활용해 사내 지표를 자동화하여 보고 시간을 {pct}% 단축했습니다.",
+    "부서 간 협업 프로젝트에서 {skill} 관련 의사결정을 지원했습니다.",
+    "신규 제도 도입 시 {skill} 분석으로 구성원 만족도를 {pct}% 개선했습니다.",
+    "팀원 {n}명과 함께 {skill} 교육 과정을 설계하고 운영했습니다.",
+]
+
+
+def _sentence(rng):
+    return rng.choice(SENTENCES).format(
+        company=rng.choice(COMPANIES), years=rng.randint(1, 12), role=rng.choice(ROLES),
+        skill=rng.choice(SKILLS), pct=rng.randint(5, 60), n=rng.randint(2, 15),
+    )
+
+
+# ✅ 이력서 n개 (문장 수로 길이 조절)
+def make_resumes(n, min_sentences=5, max_sentences=40, seed=0):
+    rng = random.Random(seed)
+    resumes = []
+    for i in range(n):
+        body = " ".join(_sentence(rng) for _ in range(rng.randint(min_sentences, max_sentences)))
+        resumes.append({"name": f"candidate_{i:05d}.txt", "text": f"지원자 {i}\n{body}"})
+    return resumes
+
+
+def make_jd(seed=0):
+    rng = random.Random(seed)
+    skills = rng.sample(SKILLS, 4)
+    return f"{rng.choice(ROLES)} 채용. 필수 역량: {', '.join(skills)}. 유관 경력 3년 이상, 협업과 데이터 기반 의사결정 경험 우대."
+
+
+def make_jds(n, seed=0):
+    return [make_jd(seed + i) for i in range(n)]
@@ -0,0 +1,218 @@
+# 로컬 OpenAI 호환 목 서버
+# /v1/chat/completions (스트리밍 포함)와 /v1/embeddings를 흉내 내며, 응답 지연과 초당 요청 제한(429)을 설정할 수 있다.
+# 실제 API 비용 없이 파이프라인 처리량을 측정하기 위한 용도.
+#
+# 단독 실행: python benchmarks/mock_openai_server.py --port 8901 --latency 0.2 --rate-limit 20
+# 앱 연결: 사이드바 Base URL에 http://127.0.0.1:8901/v1 입력 (API Key는 아무 값)
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+ANALYSIS_REPLY = {
+    "핵심 경험과 키워드": ["데이터 분석", "Python", "협업", "프로젝트 관리"],
+    "전반적 적합도 점수": 0,
+    "강점": ["문제 해결 경험", "데이터 기반 의사결정"],
+    "우려사항": ["리더십 경험 부족"],
+    "종합 의견 요약": "JD와 관련된 실무 경험이 확인됩니다.",
+    "추천 여부": "추천",
+    "미래 잠재역량 또는 성장 가능성": "데이터 역량 성장 가능성이 높음",
+    "역량별 평가 코멘트": {
+        "문제 해결력": "우수",
+        "데이터 활용력": "높음",
+        "협업/커뮤니케이션": "보통",
+        "학습 및 성장의지": "우수",
+    },
+}
+FEATURE_REPLY = {"핵심 역량": ["데이터 분석"], "경험 키워드": ["Python", "SQL"], "소프트 스킬": ["협업", "소통", "책임감"]}
+
+
+def _approx_tokens(text):
+    return max(1, len(text) // 2)
+
+
+def _seed(text):
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+# ✅ 프롬프트 종류에 맞는 가짜 응답 (입력이 같으면 항상 같은 응답)
+# response_format을 지정한 요청은 실제 API처럼 코드 펜스 없는 JSON만 돌려준다
+def fake_reply(prompt, structured=False):
+    if "JSON 형식으로 분석" in prompt:
+        reply = json.dumps(dict(ANALYSIS_REPLY, **{"전반적 적합도 점수": _seed(prompt) % 61 + 40}), ensure_ascii=False)
+        return reply if structured else "```json\n" + reply + "\n```"
+    if "JSON" in prompt:
+        return json.dumps(FEATURE_REPLY, ensure_ascii=False)
+    return "요약: " + " ".join(re.findall(r"\w+", prompt)[:60])
+
+
+class RateLimiter:
+    def __init__(self, per_second):
+        self.per_second = per_second
+        self.tokens = per_second
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.per_second, self.tokens + (now - self.updated) * self.per_second)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class MockOpenAIServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, jitter=0.02, per_item_latency=0.0005,
+                 rate_limit=None, embedding_dim=256, stream_chunks=20):
+        self.latency = latency
+        self.jitter = jitter
+        self.per_item_latency = per_item_latency
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.embedding_dim = embedding_dim
+        self.stream_chunks = stream_chunks
+        self.requests = 0
+        self.rate_limited = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _sleep(self, items=1):
+        time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter) + self.per_item_latency * items))
+
+    def _embedding(self, text, encoding_format):
+        vector = np.random.default_rng(_seed(text)).standard_normal(self.embedding_dim).astype(np.float32)
+        vector /= np.linalg.norm(vector)
+        if encoding_format == "base64":
+            return base64.b64encode(vector.astype("<f4").tobytes()).decode()
+        return vector.tolist()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status, payload, headers=None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                server.requests += 1
+                if server.limiter and not server.limiter.allow():
+                    server.rate_limited += 1
+                    error = {"error": {"message": "Rate limit reached", "type": "rate_limit_error", "code": "rate_limit_exceeded"}}
+                    return self._json(429, error, {"retry-after-ms": "200"})
+                if self.path.endswith("/chat/completions"):
+                    return self._chat(body)
+                if self.path.endswith("/embeddings"):
+                    return self._embeddings(body)
+                self._json(404, {"error": {"message": f"unknown path {self.path}", "type": "invalid_request_error"}})
+
+            def _chat(self, body):
+                prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+                content = fake_reply(prompt, structured=bool(body.get("response_format")))
+                usage = {"prompt_tokens": _approx_tokens(prompt), "completion_tokens": _approx_tokens(content)}
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                base = {"id": f"chatcmpl-{server.requests}", "created": int(time.time()), "model": body.get("model", "mock")}
+
+                if not body.get("stream"):
+                    server._sleep()
+                    choice = {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                    return self._json(200, dict(base, object="chat.completion", choices=[choice], usage=usage))
+
+                # 스트리밍: 첫 토큰까지 지연 후 조각 단위로 전송 (SSE)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                server._sleep()
+                step = max(1, len(content) // server.stream_chunks)
+                try:
+                    for i in range(0, len(content), step):
+                        delta = {"index": 0, "delta": {"content": content[i:i + step]}, "finish_reason": None}
+                        chunk = dict(base, object="chat.completion.chunk", choices=[delta])
+                        self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        time.sleep(server.per_item_latency)
+                    done = dict(base, object="chat.completion.chunk", choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}], usage=usage)
+                    self.wfile.write(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                self.close_connection = True
+
+            def _embeddings(self, body):
+                inputs = body.get("input", [])
+                inputs = [inputs] if isinstance(inputs, str) else inputs
+                server._sleep(len(inputs))
+                fmt = body.get("encoding_format", "float")
+                data = [{"object": "embedding", "index": i, "embedding": server._embedding(str(t), fmt)} for i, t in enumerate(inputs)]
+                tokens = sum(_approx_tokens(str(t)) for t in inputs)
+                self._json(200, {"object": "list", "data": data, "model": body.get("model", "mock"),
+                                 "usage": {"prompt_tokens": tokens, "total_tokens": tokens}})
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 OpenAI 호환 목 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency", type=float, default=0.2, help="요청당 기본 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--rate-limit", type=float, default=None, help="초당 허용 요청 수 (초과 시 429)")
+    parser.add_argument("--embedding-dim", type=int, default=1536)
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(args.host, args.port, args.latency, args.jitter, rate_limit=args.rate_limit, embedding_dim=args.embedding_dim)
+    print(f"mock OpenAI server: {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# 분석 리포트 페이로드/메모리 벤치마크
+# 합성 분석 결과로 app_v2 리포트를 만들어 이미지 인라인(base64 단일 페이지) 방식과
+# 정적 에셋(내용 해시 URL) + 페이지 분할 방식의 HTML 크기, 소요 시간, 최대 RSS, 남은 Figure 수를 비교한다.
+# 설정마다 별도 프로세스에서 실행해 RSS가 서로 섞이지 않게 한다.
+#
+# 사용법: python benchmarks/report_payload.py --sizes 10,100 --page-size 10 [--output bench.jsonl]
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+
+from corpus import SKILLS
+
+MODES = ["inline", "assets"]
+COMPETENCIES = ["문제 해결력", "데이터 활용력", "협업/커뮤니케이션", "학습 및 성장의지"]
+COMMENTS = ["매우 우수한 역량을 보임", "보통 수준으로 판단됨", "다소 부족하여 보완 필요"]
+
+
+def make_results(n, seed=0):
+    rng = random.Random(seed)
+    return [{
+        "파일명": f"candidate_{i:05d}.txt",
+        "핵심 경험과 키워드": rng.sample(SKILLS, 6),
+        "전반적 적합도 점수": rng.randint(40, 100),
+        "강점": rng.sample(SKILLS, 3),
+        "우려사항": rng.sample(SKILLS, rng.randint(0, 3)),
+        "종합 의견 요약": "직무 관련 경험이 충분하며 협업 역량이 돋보임",
+        "추천 여부": rng.choice(["추천", "보류"]),
+        "미래 잠재역량 또는 성장 가능성": "데이터 기반 HR 리더로 성장 가능",
+        "역량별 평가 코멘트": {c: rng.choice(COMMENTS) for c in COMPETENCIES},
+    } for i in range(n)]
+
+
+# kaleido(Chrome) 없이도 돌도록 레이더 차트는 matplotlib 극좌표로 대신 그린다
+def radar_png(labels, values):
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from report_builder import fig_png
+
+    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
+    fig, ax = plt.subplots(subplot_kw={"polar": True}, figsize=(4, 4))
+    ax.fill(angles + angles[:1], values + values[:1], alpha=0.3)
+    ax.set_xticks(angles)
+    ax.set_ylim(0, 5)
+    return fig_png(fig)
+
+
+def summary_pngs(results, features):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from report_builder import fig_png
+
+    df = features.set_index("파일명")[["적합도", "강점", "우려사항"]]
+    fig1, ax1 = plt.subplots()
+    sns.heatmap(df, annot=True, fmt=".0f", ax=ax1)
+    fig2, ax2 = plt.subplots()
+    sns.barplot(x=df.columns, y=df.mean().values, ax=ax2)
+    return fig_png(fig1), fig_png(fig2)
+
+
+# ✅ 설정 1개 측정 (자식 프로세스에서 실행)
+def measure(mode, n, page_size, workdir):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from asset_manager import render_wordcloud
+    from fit_scoring import build_features, comment_score
+    from report_builder import AssetStore, candidate_section, summary_section, render_page, peak_rss_mb
+
+    results = make_results(n)
+    features = build_features(results)
+    assets = AssetStore(root=os.path.join(workdir, "report"), inline=(mode == "inline"))
+    # 인라인 방식은 기존처럼 전체를 한 페이지로, 에셋 방식은 page_size 단위로 나눈다
+    size = n if mode == "inline" else page_size
+    pages = []
+    start = time.perf_counter()
+    for p in range(0, n, size):
+        sections = []
+        for r in results[p:p + size]:
+            values = [comment_score(v) for v in r["역량별 평가 코멘트"].values()]
+            sections.append(candidate_section(
+                r,
+                assets.put(render_wordcloud(" ".join(r["핵심 경험과 키워드"]), width=600, height=300)),
+                assets.put(radar_png(list(r["역량별 평가 코멘트"]), values)),
+            ))
+        if p + size >= n:
+            sections.append(summary_section(*[assets.put(png) for png in summary_pngs(results, features)]))
+        pages.append(render_page("채용 적합도 분석 리포트", sections))
+    wall = time.perf_counter() - start
+
+    payloads = [len(html.encode("utf-8")) for html in pages]
+    asset_dir = os.path.join(workdir, "report")
+    asset_bytes = sum(os.path.getsize(os.path.join(asset_dir, f)) for f in os.listdir(asset_dir)) if os.path.isdir(asset_dir) else 0
+    return {
+        "mode": mode,
+        "candidates": n,
+        "pages": len(pages),
+        "wall_s": round(wall, 3),
+        "max_page_kb": round(max(payloads) / 1024, 1),
+        "total_kb": round(sum(payloads) / 1024, 1),
+        "asset_kb": round(asset_bytes / 1024, 1),
+        "peak_rss_mb": round(peak_rss_mb() or 0, 1),
+        "open_figures": len(plt.get_fignums()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리포트 페이로드/메모리 벤치마크")
+    parser.add_argument("--sizes", default="10,100", help="지원자 수 (쉼표 구분)")
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--output", default=None, help="결과를 JSON lines로 추가 기록할 파일")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # 워드클라우드 디스크 캐시가 측정에 섞이지 않도록 임시 디렉터리 사용
+        with tempfile.TemporaryDirectory() as workdir:
+            os.environ["HR_ASSET_CACHE"] = workdir
+            from asset_manager import korean_font_path, FontNotFoundError
+
+            try:
+                korean_font_path()
+            except FontNotFoundError as e:
+                # 페이로드 크기 측정용이므로 한글 폰트가 없으면 matplotlib 기본 폰트로 대신 렌더링
+                import matplotlib
+
+                os.environ["HR_KOREAN_FONT"] = os.path.join(matplotlib.get_data_path(), "fonts", "ttf", "DejaVuSans.ttf")
+                print(f"{e} → DejaVuSans로 대체", file=sys.stderr)
+            print(json.dumps(measure(args.child[0], int(args.child[1]), args.page_size, workdir)))
+        return
+
+    rows = []
+    for n in [int(s) for s in args.sizes.split(",")]:
+        for mode in args.modes.split(","):
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, str(n), "--page-size", str(args.page_size)],
+                capture_output=True, text=True, check=True,
+            )
+            rows.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    header = f"{'mode':<7} {'n':>6} {'pages':>6} {'wall_s':>8} {'page_kb':>9} {'total_kb':>10} {'asset_kb':>9} {'rss_mb':>7} {'figs':>5}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['mode']:<7} {r['candidates']:>6} {r['pages']:>6} {r['wall_s']:>8} {r['max_page_kb']:>9} "
+              f"{r['total_kb']:>10} {r['asset_kb']:>9} {r['peak_rss_mb']:>7} {r['open_figures']:>5}")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(dict(r, timestamp=time.time(), page_size=args.page_size)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
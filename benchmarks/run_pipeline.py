@@ -0,0 +1,243 @@
+# 오프라인 파이프라인 벤치마크
+# 목 서버를 띄우고 합성 코퍼스 크기별로 각 단계를 실행해 처리량(초당 처리 단위 수), 호출 지연 p50/p99, 최대 RSS를 보고한다.
+# 처리 단위는 단계마다 다르다: search는 JD 조회(queries), 나머지는 지원자(candidates).
+#
+# 사용법: python benchmarks/run_pipeline.py --sizes 10,100,1000 --latency 0.2 --rate-limit 50 [--output bench.jsonl]
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import openai
+
+from corpus import make_resumes, make_jds
+from mock_openai_server import MockOpenAIServer
+
+STAGES = ["extract", "analysis", "embedding", "search", "features", "scoring"]
+
+
+def _rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# ✅ 단계 실행 중 최대 RSS 측정 (10ms 간격 샘플링)
+class PeakRSS:
+    def __enter__(self):
+        self.peak = _rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, _rss())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss())
+
+
+class _Timed:
+    def __init__(self, fn, sink):
+        self._fn = fn
+        self._sink = sink
+
+    def create(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._fn(*args, **kwargs)
+        finally:
+            self._sink.append(time.perf_counter() - start)
+
+
+# ✅ API 호출별 지연을 기록하는 클라이언트 래퍼
+class TimedClient:
+    def __init__(self, client):
+        self.base_url = client.base_url
+        self.latencies = []
+        self.embeddings = _Timed(client.embeddings.create, self.latencies)
+        self.chat = SimpleNamespace(completions=_Timed(client.chat.completions.create, self.latencies))
+
+    def drain(self):
+        latencies, self.latencies[:] = list(self.latencies), []
+        return latencies
+
+
+def run_stage(name, n, fn, client, units=None, unit="candidates"):
+    client.drain()
+    with PeakRSS() as rss:
+        start = time.perf_counter()
+        item_latencies = fn()
+        wall = time.perf_counter() - start
+    latencies = item_latencies or client.drain()
+    units = n if units is None else units
+    return {
+        "stage": name,
+        "candidates": n,
+        "wall_s": round(wall, 4),
+        "unit": unit,
+        "per_s": round(units / wall, 2) if wall else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 2) if latencies else None,
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 2) if latencies else None,
+        "calls": len(latencies),
+        "peak_rss_mb": round(rss.peak / 2**20, 1),
+    }
+
+
+def run_size(n, client, args, workdir):
+    from candidate_analysis import analyze_resume, profile_resume
+    from candidate_store import CandidateStore
+    from fit_scoring import build_features, rank_candidates
+    from gpt_scheduler import run_bounded
+    from llm_cache import LLMCache
+    from structured_output import ParseStats
+    from text_ingest import extract_many
+
+    resumes = make_resumes(n)
+    jds = make_jds(args.queries)
+    state = {}
+
+    def extract():
+        files = [(r["name"], r["text"].encode("utf-8")) for r in resumes]
+        extracted = extract_many(files)
+        state["texts"] = [e["text"] for e in extracted]
+        return [e["seconds"] for e in extracted]
+
+    # app_v2와 같은 경로: 실제 분석 프롬프트 + LLM 캐시(크기별 빈 캐시) + 스키마 추출
+    def analysis():
+        cache = LLMCache(os.path.join(workdir, f"llm_cache_{n}"))
+        state["parse_stats"] = ParseStats()
+
+        def worker(text):
+            return analyze_resume(client, cache, jds[0], text, stats=state["parse_stats"])
+
+        state["results"] = []
+        for i, parsed, err in run_bounded(state["texts"], worker, max_workers=args.workers):
+            if err:
+                raise err
+            parsed["파일명"] = resumes[i]["name"]
+            state["results"].append(parsed)
+
+    def embedding():
+        state["store"] = CandidateStore(os.path.join(workdir, f"store_{n}"))
+        state["store"].add(client, state["texts"], [r["name"] for r in resumes], batch_size=args.batch_size, max_workers=args.workers)
+
+    def search():
+        latencies = []
+        for jd in jds:
+            start = time.perf_counter()
+            query = client.embeddings.create(input=jd, model="text-embedding-ada-002").data[0].embedding
+            state["store"].top_k(query, k=min(50, n))
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    # 대시보드와 같은 경로: 토큰 예산 축약 + LLM 캐시(크기별 빈 캐시) + 스키마 추출
+    def features():
+        cache = LLMCache(os.path.join(workdir, f"profile_cache_{n}"))
+        state["profile_stats"] = ParseStats()
+
+        def worker(text):
+            return profile_resume(client, cache, text, budget=args.gpt_budget, stats=state["profile_stats"])
+
+        # --profile-k: 캐스케이드 모드처럼 첫 JD 유사도 상위 K명만 프로파일링
+        texts = state["texts"]
+        if args.profile_k:
+            query = client.embeddings.create(input=jds[0], model="text-embedding-ada-002").data[0].embedding
+            rows, _ = state["store"].top_k(query, k=min(args.profile_k, n))
+            texts = [state["store"].text(r) for r in rows]
+        for _, _, err in run_bounded(texts, worker, max_workers=args.workers):
+            if err:
+                raise err
+
+    def scoring():
+        features_df = build_features(state["results"])
+        latencies = []
+        for _ in range(20):
+            start = time.perf_counter()
+            rank_candidates(features_df, {"핵심 경험과 키워드": 3, "강점": 3, "우려사항": 3, "미래 잠재역량": 2})
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    stage_fns = {"extract": extract, "analysis": analysis, "embedding": embedding, "search": search, "features": features, "scoring": scoring}
+    # search는 JD 조회 수, features는 실제로 프로파일링한 지원자 수 기준 처리량
+    units = {"search": (args.queries, "queries"), "features": (min(args.profile_k, n) if args.profile_k else n, "candidates")}
+    rows = [run_stage(name, n, stage_fns[name], client, *units.get(name, ())) for name in STAGES if name in args.stages]
+    parse_stats = {"analysis": "parse_stats", "features": "profile_stats"}
+    for r in rows:
+        if r["stage"] in parse_stats:
+            r["parse_success"] = round(state[parse_stats[r["stage"]]].stats()["parse_success"], 4)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목 서버 기반 오프라인 파이프라인 벤치마크")
+    parser.add_argument("--sizes", default="10,100,1000", help="코퍼스 크기 (쉼표 구분)")
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--latency", type=float, default=0.05, help="목 서버 요청당 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--rate-limit", type=float, default=None, help="목 서버 초당 요청 제한")
+    parser.add_argument("--embedding-dim", type=int, default=1536)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=5, help="search 단계에서 매칭할 JD 수")
+    parser.add_argument("--profile-k", type=int, default=0, help="features 단계에서 유사도 상위 K명만 프로파일링 (0 = 전체)")
+    parser.add_argument("--gpt-budget", type=int, default=3000, help="features 단계 이력서당 GPT 입력 토큰 예산")
+    parser.add_argument("--base-url", default=None, help="외부 OpenAI 호환 서버 주소 (미지정 시 목 서버 실행)")
+    parser.add_argument("--output", default=None, help="결과를 JSON lines로 추가 기록할 파일")
+    args = parser.parse_args()
+    args.stages = args.stages.split(",")
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = MockOpenAIServer(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit, embedding_dim=args.embedding_dim)
+        base_url = server.start()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["HR_TEXT_CACHE"] = os.path.join(workdir, "text_cache")
+        client = TimedClient(openai.OpenAI(api_key="mock", base_url=base_url, max_retries=10))
+        for n in [int(s) for s in args.sizes.split(",")]:
+            rows.extend(run_size(n, client, args, workdir))
+
+    if server:
+        server.stop()
+
+    header = f"{'stage':<10} {'n':>6} {'wall_s':>8} {'per_s':>9} {'unit':<10} {'p50_ms':>8} {'p99_ms':>8} {'calls':>6} {'rss_mb':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        cells = {k: "-" if r[k] is None else r[k] for k in ("per_s", "p50_ms", "p99_ms")}
+        print(f"{r['stage']:<10} {r['candidates']:>6} {r['wall_s']:>8} {cells['per_s']:>9} {r['unit']:<10} "
+              f"{cells['p50_ms']:>8} {cells['p99_ms']:>8} {r['calls']:>6} {r['peak_rss_mb']:>7}")
+    for r in rows:
+        if "parse_success" in r:
+            print(f"{r['stage']} n={r['candidates']}: JSON parse success {r['parse_success']:.1%}")
+    if server:
+        print(f"mock server: {server.requests} requests, {server.rate_limited} rate-limited")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(dict(r, timestamp=time.time(), latency=args.latency, workers=args.workers)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# 콜드 스타트 import 시간 측정 및 예산 검사
+# 각 Streamlit 앱의 최상위 import 문만 뽑아 새 파이썬 프로세스에서 실행하고(-X importtime),
+# streamlit 런타임 자체를 제외한 import 시간이 예산을 넘으면 종료 코드 1로 실패한다.
+#
+# 사용법: python benchmarks/startup_budget.py [--budget 1.0] [--top 10] [app.py ...]
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = ["app.py", "app_v2.py", "smart_candidate_matcher_app.py"]
+MARKER = "__startup_budget_marker__"
+
+RUNNER = """
+import sys, time
+import streamlit  # Streamlit 런타임이 이미 불러온 상태를 재현
+sys.stderr.write("{marker}\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+for statement in {statements!r}:
+    try:
+        exec(statement)
+    except ImportError as e:
+        print(f"missing: {{e}}")
+print(time.perf_counter() - start)
+"""
+
+
+# ✅ 앱 파일의 최상위 import 문만 추출
+def top_level_imports(path):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+# ✅ 새 프로세스에서 import 시간 측정 → (총 시간, [(누적 µs, 모듈)])
+def profile_app(path):
+    code = RUNNER.format(marker=MARKER, statements=top_level_imports(path))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    stderr = proc.stderr.split(MARKER, 1)[-1]
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        # 들여쓰기가 한 칸인 항목만 최상위 import (하위 의존성은 누적 시간에 포함됨)
+        if not name.startswith("  "):
+            modules.append((int(cumulative_us), name.strip()))
+    output = proc.stdout.strip().splitlines()
+    missing = [line for line in output if line.startswith("missing:")]
+    return float(output[-1]), sorted(modules, reverse=True), missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit 앱 콜드 스타트 import 시간 예산 검사")
+    parser.add_argument("apps", nargs="*", default=APPS)
+    parser.add_argument("--budget", type=float, default=float(os.environ.get("HR_STARTUP_BUDGET", "1.0")), help="앱별 허용 import 시간(초)")
+    parser.add_argument("--top", type=int, default=10, help="출력할 느린 모듈 개수")
+    args = parser.parse_args()
+
+    failed = []
+    for app in args.apps:
+        seconds, modules, missing = profile_app(os.path.join(ROOT, app))
+        status = "OK" if seconds <= args.budget else "OVER BUDGET"
+        print(f"{app}: {seconds:.3f}s (budget {args.budget:.3f}s) {status}")
+        for line in missing:
+            print(f"    {line}")
+        for cumulative_us, name in modules[:args.top]:
+            print(f"    {cumulative_us / 1e6:8.3f}s  {name}")
+        if seconds > args.budget:
+            failed.append(app)
+
+    if failed:
+        print(f"콜드 스타트 예산 초과: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# 지원서 GPT 분석
+# app_v2의 분석 프롬프트와 후보 매칭 대시보드의 이력서 프로필 프롬프트, 결과 스키마, 스키마 추출 호출을
+# 한곳에 모아 앱과 벤치마크가 같은 경로를 쓰게 한다.
+
+from gpt_scheduler import estimate_tokens
+from resume_chunking import trim_to_budget
+from structured_output import extract, example_json
+
+ANALYSIS_MODEL = "gpt-4o"
+# 분석 JSON 응답 1건의 예상 출력 토큰 (TPM 예산 계산용, 한글 응답 기준 여유 포함)
+EXPECTED_COMPLETION_TOKENS = 1200
+
+# ✅ GPT 분석 결과 스키마 (응답 형식 지정 + 검증, 누락 항목은 재질의 후 기본값)
+ANALYSIS_SCHEMA = {
+    "핵심 경험과 키워드": [str],
+    "전반적 적합도 점수": int,
+    "강점": [str],
+    "우려사항": [str],
+    "종합 의견 요약": str,
+    "추천 여부": str,
+    "미래 잠재역량 또는 성장 가능성": str,
+    "역량별 평가 코멘트": {
+        "문제 해결력": str,
+        "데이터 활용력": str,
+        "협업/커뮤니케이션": str,
+        "학습 및 성장의지": str,
+    },
+}
+
+
+# ✅ GPT 분석 프롬프트
+def build_prompt(jd, text):
+    return f"""
+        JD 또는 기대사항: {jd}
+
+        자기소개서:
+        {text}
+
+        다음 항목에 대해 JSON 형식으로 분석해줘:
+        {{
+        "핵심 경험과 키워드": [...],
+        "전반적 적합도 점수": 0~100 정수,
+        "강점": [...],
+        "우려사항": [...],
+        "종합 의견 요약": "...",
+        "추천 여부": "...",
+        "미래 잠재역량 또는 성장 가능성": "...",
+        "역량별 평가 코멘트": {{
+            "문제 해결력": "...",
+            "데이터 활용력": "...",
+            "협업/커뮤니케이션": "...",
+            "학습 및 성장의지": "..."
+        }}
+        }}
+        """
+
+
+# ✅ 지원서 1건 분석 (LLM 캐시 → 응답 형식 지정 + 검증/복구, 항상 스키마의 모든 키를 가진 dict 반환)
+# before_call(messages)은 캐시 미적중으로 실제 API를 호출할 때만 불린다 (TPM 예산 확보용)
+def analyze_resume(client, cache, jd, text, on_usage=None, stats=None, model=ANALYSIS_MODEL, before_call=None):
+    return extract(client, cache, model, build_prompt(jd, text), ANALYSIS_SCHEMA,
+                   name="candidate_analysis", on_usage=on_usage, stats=stats, before_call=before_call)
+
+
+# 실제 요청 1건의 TPM 비용 = 프롬프트 토큰 + 예상 출력 토큰
+def request_tokens(messages):
+    return sum(estimate_tokens(m["content"]) for m in messages) + EXPECTED_COMPLETION_TOKENS
+
+
+# ✅ 후보 매칭 대시보드의 이력서 프로필 (입력 토큰 예산만큼 축약 → 스키마 추출, 같은 이력서는 LLM 캐시에서 즉시 반환)
+PROFILE_MODEL = "gpt-4"
+FEATURE_SCHEMA = {"핵심 역량": [str], "경험 키워드": [str], "소프트 스킬": [str]}
+
+
+def build_profile_prompt(text, budget=3000):
+    return f"이 이력서의 핵심 역량, 경험 키워드, 소프트 스킬 3가지를 JSON으로 요약 (형식: {example_json(FEATURE_SCHEMA)}):\n{trim_to_budget(text, budget=budget)}"
+
+
+def profile_resume(client, cache, text, budget=3000, on_usage=None, stats=None, model=PROFILE_MODEL):
+    return extract(client, cache, model, build_profile_prompt(text, budget), FEATURE_SCHEMA,
+                   name="resume_features", on_usage=on_usage, stats=stats)
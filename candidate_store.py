@@ -0,0 +1,149 @@
+# 후보자 임베딩 저장소
+# 이력서 임베딩을 디스크의 float32 행렬(memmap)로 보관하고, 내용 해시로 중복 임베딩을 막는다.
+# 모델 한도를 넘는 긴 이력서는 청크 임베딩을 풀링한 벡터 하나로 저장된다.
+# JD 매칭 시에는 JD만 임베딩한 뒤 전체 풀에 대해 한 번의 벡터 연산으로 top-k를 구한다.
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from embedding_batch import EMBED_MODEL
+from resume_chunking import embed_documents
+
+
+def content_key(text, model=EMBED_MODEL):
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class CandidateStore:
+    def __init__(self, root=".candidate_store", model=EMBED_MODEL):
+        self.root = root
+        self.model = model
+        self._vec_path = os.path.join(root, "vectors.f32")
+        self._meta_path = os.path.join(root, "meta.jsonl")
+        self._info_path = os.path.join(root, "store.json")
+        self._lock = threading.Lock()
+        self._matrix = None
+        self.meta = []
+        self.index = {}
+        self.dim = None
+        os.makedirs(root, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self._info_path):
+            with open(self._info_path, encoding="utf-8") as f:
+                info = json.load(f)
+            if info.get("model") != self.model:
+                raise ValueError(f"저장소 모델 불일치: {info.get('model')} != {self.model}")
+            self.dim = info["dim"]
+        if os.path.exists(self._meta_path):
+            # 본문은 메모리에 올리지 않고 파일 내 위치만 기억한다 (필요할 때 text()로 읽음)
+            with open(self._meta_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # 기록 중 중단된 마지막 줄
+                    if line.strip():
+                        rec = json.loads(line)
+                        self.index[rec["key"]] = len(self.meta)
+                        self.meta.append({"key": rec["key"], "src": rec["src"], "offset": offset})
+                    offset += len(line)
+            if offset < os.path.getsize(self._meta_path):
+                os.truncate(self._meta_path, offset)
+        self._repair_vectors()
+
+    # 벡터 기록 후 메타 기록 전에 중단되면 메타 없는 벡터 행이 남는다.
+    # 그대로 두면 다음 add()의 벡터가 그 뒤에 붙어 행 번호와 어긋나므로 메타 행 수에 맞춰 잘라낸다.
+    def _repair_vectors(self):
+        if self.dim is None or not os.path.exists(self._vec_path):
+            return
+        expected = len(self.meta) * self.dim * 4
+        actual = os.path.getsize(self._vec_path)
+        if actual < expected:
+            raise ValueError(f"벡터 파일이 메타보다 짧음: {actual} < {expected} bytes")
+        if actual > expected:
+            os.truncate(self._vec_path, expected)
+
+    def __len__(self):
+        return len(self.meta)
+
+    # ✅ 이력서 본문 (디스크에서 해당 행만 읽음)
+    def text(self, row):
+        with open(self._meta_path, "rb") as f:
+            f.seek(self.meta[row]["offset"])
+            return json.loads(f.readline())["text"]
+
+    # ✅ 전체 임베딩 행렬 (읽기 전용 memmap)
+    def matrix(self):
+        if not self.meta:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        if self._matrix is None or self._matrix.shape[0] != len(self.meta):
+            self._matrix = np.memmap(self._vec_path, dtype=np.float32, mode="r", shape=(len(self.meta), self.dim))
+        return self._matrix
+
+    # ✅ 새 이력서만 임베딩해서 추가하고, 입력 순서대로 행 번호 반환
+    def add(self, client, texts, srcs=None, **embed_kwargs):
+        texts = [t if isinstance(t, str) else "" for t in texts]
+        srcs = srcs or [""] * len(texts)
+        keys = [content_key(t, self.model) for t in texts]
+
+        missing = {}
+        for key, text, src in zip(keys, texts, srcs):
+            if key not in self.index and key not in missing:
+                missing[key] = (text, src)
+
+        if missing:
+            vectors = _normalize(embed_documents(client, [t for t, _ in missing.values()], model=self.model, **embed_kwargs))
+            with self._lock:
+                if self.dim is None:
+                    self.dim = int(vectors.shape[1])
+                    with open(self._info_path, "w", encoding="utf-8") as f:
+                        json.dump({"model": self.model, "dim": self.dim}, f)
+                # 벡터를 먼저 기록한 뒤 메타를 추가해야 중단 시에도 메타 행 수 <= 벡터 행 수가 유지된다
+                with open(self._vec_path, "ab") as f:
+                    vectors.tofile(f)
+                with open(self._meta_path, "ab") as f:
+                    for key, (text, src) in missing.items():
+                        offset = f.tell()
+                        f.write((json.dumps({"key": key, "src": src, "text": text}, ensure_ascii=False) + "\n").encode("utf-8"))
+                        self.index[key] = len(self.meta)
+                        self.meta.append({"key": key, "src": src, "offset": offset})
+                self._matrix = None
+
+        return np.array([self.index[k] for k in keys], dtype=np.int64)
+
+    # ✅ 코사인 유사도 (저장 벡터는 정규화되어 있으므로 내적 한 번)
+    # rows를 지정하면 block 행씩 나눠 계산해 memmap 전체가 메모리로 복사되지 않게 한다
+    def scores(self, query, rows=None, block=16384):
+        if not self.meta or (rows is not None and len(rows) == 0):
+            return np.zeros(0, dtype=np.float32)
+        query = _normalize(np.asarray(query, dtype=np.float32))
+        matrix = self.matrix()
+        if rows is None:
+            return np.asarray(matrix @ query)
+        rows = np.asarray(rows)
+        out = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), block):
+            out[start:start + block] = matrix[rows[start:start + block]] @ query
+        return out
+
+    # ✅ 상위 k명 검색 (argpartition으로 전체 정렬 없이 선택)
+    def top_k(self, query, k=10, rows=None):
+        scores = self.scores(query, rows)
+        if len(scores) == 0:
+            return np.zeros(0, dtype=np.int64), scores
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        ids = np.asarray(rows)[top] if rows is not None else top
+        return ids, scores[top]
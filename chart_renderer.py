@@ -0,0 +1,77 @@
+# 차트 렌더링 서비스
+# kaleido 렌더러(브라우저 탭 n개)를 백그라운드 이벤트 루프에 띄워 두고 재사용하며,
+# 여러 후보자의 레이더 차트를 병렬로 렌더링한다. 라벨/값이 같은 차트는 한 번만 그린다.
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import plotly.graph_objects as go
+
+
+# ✅ 레이더 차트 Figure
+def radar_figure(labels, values):
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(r=values, theta=labels, fill='toself'))
+    fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 5])), showlegend=False)
+    return fig
+
+
+class ChartRenderer:
+    def __init__(self, workers=4):
+        self.workers = workers
+        self._memo = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._loop = None
+        self._kaleido = None
+        self._fallback = None
+        threading.Thread(target=self._serve, daemon=True).start()
+        self._ready.wait()
+
+    # 렌더러를 띄운 채로 유지하는 백그라운드 이벤트 루프
+    def _serve(self):
+        try:
+            from kaleido import Kaleido
+        except ImportError:
+            # kaleido 0.x: plotly가 내부적으로 렌더러 프로세스를 유지하므로 스레드 풀로 병렬화
+            self._fallback = ThreadPoolExecutor(max_workers=self.workers)
+            self._ready.set()
+            return
+
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        async def hold():
+            async with Kaleido(n=self.workers) as k:
+                self._kaleido = k
+                self._ready.set()
+                await asyncio.Event().wait()
+
+        try:
+            self._loop.run_until_complete(hold())
+        except Exception:
+            self._kaleido = None
+            self._fallback = ThreadPoolExecutor(max_workers=self.workers)
+            self._ready.set()
+
+    def _submit(self, fig, width, height):
+        if self._kaleido is not None:
+            opts = {"format": "png", "width": width, "height": height}
+            return asyncio.run_coroutine_threadsafe(self._kaleido.calc_fig(fig, opts=opts), self._loop)
+        return self._fallback.submit(fig.to_image, format="png", width=width, height=height)
+
+    # ✅ 레이더 차트 PNG Future (같은 라벨/값/크기는 같은 Future 공유)
+    def radar(self, labels, values, width=500, height=400):
+        key = (tuple(labels), tuple(values), width, height)
+        with self._lock:
+            fut = self._memo.get(key)
+            if fut is None or (fut.done() and fut.exception() is not None):
+                fut = self._submit(radar_figure(labels, values), width, height)
+                self._memo[key] = fut
+            return fut
+
+    # ✅ 여러 차트를 한꺼번에 제출한 뒤 입력 순서대로 PNG 반환
+    def radars(self, charts, width=500, height=400):
+        futures = [self.radar(labels, values, width, height) for labels, values in charts]
+        return [fut.result() for fut in futures]
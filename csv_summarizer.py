@@ -0,0 +1,120 @@
+# CSV 맵-리듀스 요약
+# 1) pandas로 전체 데이터 집계(컬럼 프로파일, 값 빈도, 그룹 요약)를 만들고
+# 2) 행을 토큰 예산 단위 청크로 나눠 병렬로 부분 요약한 뒤
+# 3) 부분 요약들을 합쳐 최종 인사이트를 만든다. 청크 수는 상한이 있어 행 수와 무관하게 비용이 제한된다.
+
+import pandas as pd
+
+from gpt_scheduler import run_bounded, estimate_tokens
+
+
+# ✅ 전체 데이터 집계 (GPT 없이 pandas로 계산)
+def profile_dataframe(df, max_categories=20, top_values=5):
+    lines = [f"행 수: {len(df):,}, 열 수: {df.shape[1]}"]
+    categorical = []
+    for col in df.columns:
+        s = df[col]
+        nunique = s.nunique(dropna=True)
+        line = f"- {col} ({s.dtype}): 결측 {s.isna().sum():,}, 고유값 {nunique:,}"
+        is_number = pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s)
+        if is_number:
+            d = s.describe()
+            line += f", 평균 {d['mean']:.2f}, 최소 {d['min']:.2f}, 중앙 {d['50%']:.2f}, 최대 {d['max']:.2f}"
+        elif nunique < s.notna().sum():
+            # 모든 값이 고유한 자유 텍스트 컬럼은 빈도가 의미 없으므로 생략
+            top = s.value_counts().head(top_values)
+            line += ", 상위값 " + ", ".join(f"{' '.join(str(k).split())[:40]}({v:,})" for k, v in top.items())
+        if not is_number and 1 < nunique <= max_categories and nunique < s.notna().sum():
+            categorical.append(col)
+        lines.append(line)
+
+    numeric = df.select_dtypes("number").columns.tolist()
+    for col in categorical[:3]:
+        grouped = df.groupby(col, dropna=False)
+        summary = grouped[numeric].mean().round(2) if numeric else pd.DataFrame(index=grouped.size().index)
+        summary.insert(0, "건수", grouped.size())
+        lines.append(f"\n[{col}별 요약]\n{summary.to_string()}")
+    return "\n".join(lines)
+
+
+# ✅ 행을 토큰 예산 단위 청크로 분할 (청크 수 상한 초과 시 균등 표본 추출)
+def chunk_rows(df, chunk_tokens=6000, max_chunks=8):
+    header = ",".join(map(str, df.columns))
+    clean = df.astype(str).replace(r"[\r\n]+", " ", regex=True)
+    lines = clean.to_csv(index=False, header=False).splitlines()
+    costs = [estimate_tokens(line) for line in lines]
+
+    total = sum(costs)
+    sampled = total > chunk_tokens * max_chunks
+    if sampled:
+        keep = max(1, int(len(lines) * chunk_tokens * max_chunks / total))
+        step = len(lines) / keep
+        picks = [int(i * step) for i in range(keep)]
+        lines = [lines[i] for i in picks]
+        costs = [costs[i] for i in picks]
+
+    chunks, current, used = [], [], 0
+    for line, cost in zip(lines, costs):
+        if current and used + cost > chunk_tokens:
+            chunks.append(header + "\n" + "\n".join(current))
+            current, used = [], 0
+        current.append(line)
+        used += cost
+    if current:
+        chunks.append(header + "\n" + "\n".join(current))
+    # 행 단위 예산 계산과 달리 실제 채워진 청크가 상한을 넘으면 청크 단위로 다시 균등 추출
+    if len(chunks) > max_chunks:
+        step = len(chunks) / max_chunks
+        chunks = [chunks[int(i * step)] for i in range(max_chunks)]
+        sampled = True
+    return chunks, sampled
+
+
+# ✅ 부분 요약을 그룹 단위로 합치며 하나가 될 때까지 축약
+def _reduce(ask, profile, partials, chunk_tokens, max_workers):
+    while len(partials) > 1:
+        groups, current, used = [], [], 0
+        for p in partials:
+            cost = estimate_tokens(p)
+            if current and used + cost > chunk_tokens:
+                groups.append(current)
+                current, used = [], 0
+            current.append(p)
+            used += cost
+        groups.append(current)
+        if len(groups) == len(partials) and len(groups) > 1:
+            # 개별 요약이 예산보다 커도 최소 두 개씩은 합친다
+            groups = [partials[i:i + 2] for i in range(0, len(partials), 2)]
+
+        prompt = "다음은 같은 데이터셋의 전체 집계와 부분 요약들이야. 이를 종합해 핵심 인사이트를 정리해줘:\n[전체 집계]\n{profile}\n\n[부분 요약]\n{parts}"
+        merged = {}
+        for i, out, err in run_bounded(groups, lambda g: ask(prompt.format(profile=profile, parts="\n\n".join(g))), max_workers=max_workers):
+            if err:
+                raise err
+            merged[i] = out
+        partials = [merged[i] for i in sorted(merged)]
+    return partials[0]
+
+
+def summarize_csv(df, ask, chunk_tokens=6000, max_chunks=8, max_workers=4, on_progress=None):
+    profile = profile_dataframe(df)
+    chunks, sampled = chunk_rows(df, chunk_tokens, max_chunks)
+    note = " (전체 행 중 균등 추출한 표본)" if sampled else ""
+
+    prompt = "다음 전체 집계를 참고해서, 아래 데이터 일부{note}의 특징과 눈에 띄는 패턴을 간결하게 요약해줘:\n[전체 집계]\n{profile}\n\n[데이터]\n{chunk}"
+    partials = {}
+    for done, (i, out, err) in enumerate(run_bounded(chunks, lambda c: ask(prompt.format(note=note, profile=profile, chunk=c)), max_workers=max_workers), 1):
+        if err:
+            raise err
+        partials[i] = out
+        if on_progress:
+            on_progress(done, len(chunks))
+
+    partials = [partials[i] for i in sorted(partials)]
+    if not partials:
+        summary = ask(f"다음 데이터 집계로 인사이트 요약해줘:\n{profile}")
+    elif len(partials) == 1:
+        summary = partials[0]
+    else:
+        summary = _reduce(ask, profile, partials, chunk_tokens, max_workers)
+    return {"profile": profile, "chunks": len(chunks), "sampled": sampled, "partials": partials, "summary": summary}
@@ -0,0 +1,72 @@
+# 임베딩 배치 처리 유틸리티
+# 여러 텍스트를 대량 배치로 묶어 동시에 요청하고, 결과를 입력 순서대로 되돌려준다.
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import openai
+
+EMBED_MODEL = "text-embedding-ada-002"
+
+
+def _clean(text):
+    # 빈 문자열/NaN 입력은 API가 거부하므로 공백 한 칸으로 대체
+    if not isinstance(text, str) or not text.strip():
+        return " "
+    return text
+
+
+# ✅ 단일 배치 요청 (레이트 리밋 시 지수 백오프 재시도)
+def _embed_batch(client, batch, model, max_retries, on_usage=None):
+    delay = 1.0
+    for attempt in range(max_retries + 1):
+        try:
+            res = client.embeddings.create(input=batch, model=model)
+            if on_usage and res.usage:
+                on_usage(model, res.usage)
+            return [d.embedding for d in sorted(res.data, key=lambda d: d.index)]
+        except (openai.RateLimitError, openai.APIConnectionError):
+            if attempt == max_retries:
+                raise
+            time.sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 2, 30.0)
+
+
+# ✅ 배치 경계: 개수(batch_size)와 요청당 토큰 합(max_batch_tokens)을 모두 넘지 않게 분할
+# token_counts가 없으면 글자 수를 토큰 수 상한으로 사용
+def _batches(texts, batch_size, max_batch_tokens, token_counts=None):
+    costs = token_counts if token_counts is not None else [len(t) for t in texts]
+    start, used = 0, 0
+    for i, cost in enumerate(costs):
+        if i > start and (i - start >= batch_size or used + cost > max_batch_tokens):
+            yield start, i
+            start, used = i, 0
+        used += cost
+    if start < len(texts):
+        yield start, len(texts)
+
+
+# ✅ 전체 텍스트 임베딩 (배치 + 동시성 제한, 입력 순서 유지)
+def embed_texts(client, texts, model=EMBED_MODEL, batch_size=256, max_workers=4, max_retries=5,
+                on_progress=None, on_usage=None, token_counts=None, max_batch_tokens=250_000):
+    texts = [_clean(t) for t in texts]
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    vectors = [None] * len(texts)
+    done = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_embed_batch, client, texts[start:end], model, max_retries, on_usage): start
+            for start, end in _batches(texts, batch_size, max_batch_tokens, token_counts)
+        }
+        for fut in as_completed(futures):
+            start = futures[fut]
+            batch_vectors = fut.result()
+            vectors[start:start + len(batch_vectors)] = batch_vectors
+            done += len(batch_vectors)
+            if on_progress:
+                on_progress(done, len(texts))
+    return np.asarray(vectors, dtype=np.float32)
@@ -0,0 +1,44 @@
+# 가중치 기반 로컬 재순위 엔진
+# GPT 분석 결과(구조화 필드)를 한 번 특성 행렬로 만든 뒤, JD 가중치가 바뀔 때마다
+# API 호출 없이 벡터 연산만으로 점수를 다시 계산한다.
+
+import numpy as np
+import pandas as pd
+
+
+# ✅ 역량 코멘트 → 점수 (우수/높음 5, 보통 3, 그 외 1)
+def comment_score(comment):
+    return 5 if "우수" in comment or "높음" in comment else 3 if "보통" in comment else 1
+
+
+# ✅ 후보자별 특성 행렬 (결과가 바뀌지 않으면 재사용)
+def build_features(results):
+    return pd.DataFrame({
+        "파일명": [r["파일명"] for r in results],
+        "적합도": [r["전반적 적합도 점수"] for r in results],
+        "핵심 경험과 키워드": [len(r["핵심 경험과 키워드"]) for r in results],
+        "강점": [len(r["강점"]) for r in results],
+        "우려사항": [len(r["우려사항"]) for r in results],
+        # "미래 잠재력 중요도" 슬라이더는 GPT의 잠재역량/성장 가능성 평가 자체에 적용
+        "미래 잠재역량": [comment_score(r["미래 잠재역량 또는 성장 가능성"]) for r in results],
+    })
+
+
+def _minmax(values):
+    span = values.max() - values.min()
+    return (values - values.min()) / span if span else np.full(len(values), 0.5)
+
+
+# ✅ 가중 점수 및 순위
+# 가중 점수 = GPT 적합도 50% + 가중치를 반영한 특성 점수 50% (우려사항은 많을수록 감점)
+def rank_candidates(features, weights):
+    positive = ["핵심 경험과 키워드", "강점", "미래 잠재역량"]
+    total_weight = sum(weights[k] for k in positive) + weights["우려사항"]
+    feature_score = sum(weights[k] * _minmax(features[k].to_numpy(dtype=float)) for k in positive)
+    feature_score = feature_score + weights["우려사항"] * (1 - _minmax(features["우려사항"].to_numpy(dtype=float)))
+
+    ranked = features.copy()
+    ranked["가중 점수"] = np.round(0.5 * ranked["적합도"].astype(float) + 50 * feature_score / total_weight, 1)
+    ranked = ranked.sort_values("가중 점수", ascending=False, kind="stable").reset_index(drop=True)
+    ranked.insert(0, "순위", np.arange(1, len(ranked) + 1))
+    return ranked
@@ -0,0 +1,60 @@
+# GPT 호출 스케줄러
+# 동시 실행 개수와 분당 토큰 예산(TPM)을 지키면서 여러 작업을 스레드 풀에서 병렬 실행한다.
+# 완료되는 순서대로 결과를 내보내므로 UI에 바로 반영할 수 있고, 인덱스로 원래 순서를 복원한다.
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# ✅ 대략적인 토큰 수 추정 (영문 약 4자당 1토큰, 한글 등 비 ASCII는 1자당 1토큰)
+def estimate_tokens(text):
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return max(1, ascii_chars // 4 + (len(text) - ascii_chars))
+
+
+# ✅ 분당 토큰 예산 (최근 60초 슬라이딩 윈도우)
+class TokenBudget:
+    def __init__(self, tokens_per_minute, window=60.0):
+        self.tokens_per_minute = tokens_per_minute
+        self.window = window
+        self._events = deque()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens):
+        # 단일 요청이 예산보다 크면 윈도우가 빈 상태에서만 보낸다
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._events and now - self._events[0][0] >= self.window:
+                    self._used -= self._events.popleft()[1]
+                if self._used + tokens <= self.tokens_per_minute:
+                    self._events.append((now, tokens))
+                    self._used += tokens
+                    return
+                wait = self.window - (now - self._events[0][0])
+            time.sleep(max(wait, 0.01))
+
+
+# ✅ 작업 병렬 실행: (인덱스, 결과, 에러)를 완료 순서대로 반환
+# token_cost(item)는 입력 토큰 + 예상 출력 토큰 (OpenAI TPM 한도는 출력 토큰도 함께 센다)
+# token_cost는 작업 시작 전에 항상 차감되므로, 캐시 적중이 잦은 작업은 대신 TokenBudget을 직접 만들어
+# cached_chat(before_call=...)에서 실제 API를 호출할 때만 acquire한다
+def run_bounded(items, worker, max_workers=4, tokens_per_minute=None, token_cost=None):
+    budget = TokenBudget(tokens_per_minute) if tokens_per_minute else None
+
+    def call(item):
+        if budget and token_cost:
+            budget.acquire(token_cost(item))
+        return worker(item)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(call, item): i for i, item in enumerate(items)}
+        for fut in as_completed(futures):
+            try:
+                yield futures[fut], fut.result(), None
+            except Exception as e:
+                yield futures[fut], None, e
@@ -0,0 +1,180 @@
+# GPT 응답 캐시
+# 모델 + 정규화된 프롬프트 해시를 키로, 메모리 LRU와 용량 제한이 있는 디스크 계층에 응답을 저장한다.
+# 같은 입력으로 다시 분석하면 API 호출 없이 즉시 결과를 돌려준다.
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+def _normalize(text):
+    return re.sub(r"\s+", " ", text).strip()
+
+
+# endpoint(base_url)도 키에 넣어 목 서버/프록시 응답이 실제 API 호출에 재사용되지 않게 한다
+def cache_key(model, messages, endpoint=None, **params):
+    payload = {
+        "endpoint": endpoint,
+        "model": model,
+        "messages": [{"role": m["role"], "content": _normalize(m["content"])} for m in messages],
+        "params": params,
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, root=".llm_cache", max_memory_items=256, max_disk_bytes=200 * 1024 * 1024, ttl=7 * 24 * 3600):
+        self.root = root
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._disk_bytes = sum(os.path.getsize(p) for p in self._disk_files())
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def _disk_files(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".json"):
+                    yield os.path.join(dirpath, name)
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    # ✅ 조회: 메모리 → 디스크 순 (디스크 적중 시 메모리로 승격)
+    def get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry["created"]):
+                    self._memory.move_to_end(key)
+                    self.hits_memory += 1
+                    return entry["content"]
+                del self._memory[key]
+
+            path = self._path(key)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            if self._expired(entry["created"]):
+                self._remove_file(path)
+                self.misses += 1
+                return None
+            os.utime(path)  # 디스크 LRU 순서 갱신
+            self._remember(key, entry)
+            self.hits_disk += 1
+            return entry["content"]
+
+    def set(self, key, content):
+        entry = {"created": time.time(), "content": content}
+        with self._lock:
+            self._remember(key, entry)
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                self._disk_bytes -= os.path.getsize(path)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+            self._disk_bytes += os.path.getsize(path)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _remove_file(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            self._disk_bytes -= size
+        except OSError:
+            pass
+
+    # ✅ 디스크 용량 초과 시 오래 사용하지 않은 항목부터 제거 (상한의 90%까지)
+    def _evict_disk(self):
+        files = sorted(self._disk_files(), key=os.path.getmtime)
+        target = self.max_disk_bytes * 0.9
+        for path in files:
+            if self._disk_bytes <= target:
+                break
+            self._remove_file(path)
+            self.evictions += 1
+
+    def stats(self):
+        hits = self.hits_memory + self.hits_disk
+        total = hits + self.misses
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "disk_bytes": self._disk_bytes,
+        }
+
+
+# ✅ 캐시를 거치는 chat completion (응답 본문 문자열 반환)
+# on_usage(model, usage)와 before_call(messages)은 실제 API를 호출하는 경우에만 불린다 (캐시 적중은 토큰 0)
+# before_call은 요청 직전 TPM 예산 확보 등에 쓴다 (캐시 적중은 예산 대기 없이 바로 반환)
+def _endpoint(client):
+    base_url = getattr(client, "base_url", None)
+    return str(base_url) if base_url is not None else None
+
+
+def cached_chat(client, cache, model, messages, on_usage=None, before_call=None, **params):
+    key = cache_key(model, messages, _endpoint(client), **params)
+    content = cache.get(key)
+    if content is None:
+        if before_call:
+            before_call(messages)
+        res = client.chat.completions.create(model=model, messages=messages, **params)
+        content = res.choices[0].message.content
+        if on_usage and res.usage:
+            on_usage(model, res.usage)
+        cache.set(key, content)
+    return content
+
+
+# ✅ 스트리밍 chat completion (토큰 조각을 도착 즉시 반환, 끝까지 받은 응답만 캐시)
+def cached_chat_stream(client, cache, model, messages, on_usage=None, **params):
+    key = cache_key(model, messages, _endpoint(client), **params)
+    content = cache.get(key)
+    if content is not None:
+        yield content
+        return
+
+    stream = client.chat.completions.create(
+        model=model, messages=messages, stream=True, stream_options={"include_usage": True}, **params
+    )
+    parts = []
+    try:
+        for chunk in stream:
+            if on_usage and getattr(chunk, "usage", None):
+                on_usage(model, chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield parts[-1]
+    finally:
+        # 중단(리런/취소) 시 연결을 바로 닫아 남은 토큰 비용이 발생하지 않게 한다
+        stream.close()
+    cache.set(key, "".join(parts))
@@ -0,0 +1,123 @@
+# 분석 리포트 HTML 빌더
+# 차트/워드클라우드 PNG를 HTML에 base64로 넣지 않고 내용 해시 파일명의 정적 에셋으로 저장해 URL로 참조한다.
+# 같은 이미지는 같은 URL이 되므로 브라우저가 캐시하고, 리포트는 페이지 단위로 나눠 필요한 부분만 그린다.
+# Streamlit 정적 서빙(server.enableStaticServing)이 꺼져 있으면 data URI로 대체한다.
+
+import base64
+import hashlib
+import os
+import threading
+from io import BytesIO
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+# ✅ matplotlib Figure → PNG 바이트 (렌더링 후 Figure를 닫아 리런마다 메모리가 쌓이지 않게 함)
+def fig_png(fig):
+    import matplotlib.pyplot as plt
+
+    buf = BytesIO()
+    try:
+        fig.savefig(buf, format="png", bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    return buf.getvalue()
+
+
+class AssetStore:
+    def __init__(self, root=os.path.join(STATIC_DIR, "report"), url_prefix="app/static/report", inline=False, max_disk_bytes=100 * 1024 * 1024):
+        self.root = root
+        self.url_prefix = url_prefix
+        self.inline = inline
+        self.max_disk_bytes = max_disk_bytes
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        if not inline:
+            os.makedirs(root, exist_ok=True)
+
+    # ✅ PNG 저장 → 이미지 URL (같은 내용이면 파일을 다시 쓰지 않음)
+    def put(self, png):
+        if self.inline:
+            return "data:image/png;base64," + base64.b64encode(png).decode()
+        name = hashlib.sha256(png).hexdigest()[:32] + ".png"
+        path = os.path.join(self.root, name)
+        try:
+            # 이미 있는 파일은 수정 시각만 갱신해 정리 시 최근 사용 순서가 유지되게 한다
+            os.utime(path)
+        except FileNotFoundError:
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(png)
+            os.replace(tmp, path)
+            with self._lock:
+                self.bytes_written += len(png)
+                if self.bytes_written > self.max_disk_bytes // 10:
+                    self.bytes_written = 0
+                    self._evict_disk()
+        return f"{self.url_prefix}/{name}"
+
+    # 용량 초과 시 오래 안 쓴(mtime이 오래된) 파일부터 삭제
+    def _evict_disk(self):
+        files = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def _items(values):
+    return "<ul>" + "".join(f"<li>{v}</li>" for v in values) + "</ul>"
+
+
+# ✅ 후보자 1명 섹션 (wordcloud_url이 None이면 이미지 대신 안내 문구)
+def candidate_section(r, wordcloud_url, radar_url, wordcloud_note="키워드가 없어 워드클라우드를 생략했습니다."):
+    return "".join([
+        f"<h2>{r['파일명']}</h2>",
+        f"<p><b>적합도 점수:</b> {r['전반적 적합도 점수']} | <b>추천:</b> {r['추천 여부']}</p>",
+        f"<p><b>미래 잠재역량:</b> {r['미래 잠재역량 또는 성장 가능성']}</p>",
+        "<h4>📌 핵심 경험 및 키워드</h4>" + _items(r["핵심 경험과 키워드"]),
+        f"<img src='{wordcloud_url}' width='600' loading='lazy'/>" if wordcloud_url else f"<p><i>{wordcloud_note}</i></p>",
+        "<h4>💪 강점</h4>" + _items(r["강점"]),
+        "<h4>⚠️ 우려사항</h4>" + _items(r["우려사항"]),
+        "<h4>🧠 역량별 평가</h4><ul>" + "".join(f"<li><b>{k}</b>: {v}</li>" for k, v in r["역량별 평가 코멘트"].items()) + "</ul>",
+        f"<img src='{radar_url}' width='500' loading='lazy'/>",
+        f"<h4>📝 종합 의견</h4><p>{r['종합 의견 요약']}</p><hr>",
+    ])
+
+
+# ✅ 전체 지원자 종합 섹션
+def summary_section(heatmap_url, avg_url):
+    return "".join([
+        "<h2>📊 전체 지원자 종합 분석</h2>",
+        f"<h4>지원자별 지표 히트맵</h4><img src='{heatmap_url}' width='700' loading='lazy'/>",
+        f"<h4>역량 평균 점수</h4><img src='{avg_url}' width='600' loading='lazy'/>",
+    ])
+
+
+def render_page(title, sections):
+    return "".join(["<html><body>", f"<h1>{title}</h1>", *sections, "</body></html>"])
+
+
+# 프로세스 최대 RSS(MB), 측정할 수 없는 플랫폼이면 None
+def peak_rss_mb():
+    import sys
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
@@ -0,0 +1,128 @@
+# 긴 이력서 토큰 단위 처리
+# 모델 한도를 넘는 이력서를 겹치는 청크로 나눠 임베딩한 뒤 후보자 벡터 하나로 합치고(토큰 수 가중 평균),
+# GPT 입력용으로는 반복/상용구를 걷어내고 토큰 예산 안으로 줄인 본문을 만든다.
+# tiktoken이 설치되어 있으면 정확한 토큰 수를, 없으면 글자 기반 추정치를 사용한다.
+
+import functools
+import re
+
+import numpy as np
+
+from embedding_batch import embed_texts, EMBED_MODEL
+from gpt_scheduler import estimate_tokens
+
+EMBED_MAX_TOKENS = 8000  # text-embedding-ada-002 입력 한도 8191에서 여유를 둔 값
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding(model):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text, model=EMBED_MODEL):
+    enc = _encoding(model)
+    return len(enc.encode(text, disallowed_special=())) if enc else estimate_tokens(text)
+
+
+# ✅ 겹치는 청크로 분할 → [(청크, 토큰 수)]
+def split_tokens(text, max_tokens=EMBED_MAX_TOKENS, overlap=200, model=EMBED_MODEL):
+    enc = _encoding(model)
+    if enc:
+        tokens = enc.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return [(text, len(tokens))]
+        step = max_tokens - overlap
+        return [(enc.decode(tokens[i:i + max_tokens]), len(tokens[i:i + max_tokens]))
+                for i in range(0, len(tokens) - overlap, step)]
+
+    # tiktoken이 없으면 글자 수 비율로 토큰 경계를 근사 (한글은 추정 오차가 커서 한도의 절반만 사용)
+    max_tokens, overlap = max_tokens // 2, overlap // 2
+    total = estimate_tokens(text)
+    if total <= max_tokens:
+        return [(text, total)]
+    chars_per_token = len(text) / total
+    size = int(max_tokens * chars_per_token)
+    step = int((max_tokens - overlap) * chars_per_token)
+    chunks = [text[i:i + size] for i in range(0, len(text) - int(overlap * chars_per_token), step)]
+    return [(chunk, estimate_tokens(chunk)) for chunk in chunks]
+
+
+# ✅ 문서 임베딩: 청크 단위로 배치 임베딩 후 후보자별 벡터로 풀링 (입력 순서 유지)
+def embed_documents(client, texts, model=EMBED_MODEL, max_tokens=EMBED_MAX_TOKENS, overlap=200, **embed_kwargs):
+    owners, chunks, counts = [], [], []
+    for i, text in enumerate(texts):
+        for chunk, n_tokens in split_tokens(text if isinstance(text, str) else "", max_tokens, overlap, model):
+            owners.append(i)
+            chunks.append(chunk)
+            counts.append(n_tokens)
+    if not chunks:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    vectors = embed_texts(client, chunks, model=model, token_counts=counts, **embed_kwargs)
+    if len(chunks) == len(texts):
+        return vectors
+
+    # 토큰 수로 가중 평균 후 정규화
+    owners = np.asarray(owners)
+    weights = np.maximum(np.asarray(counts, dtype=np.float32), 1.0)[:, None]
+    pooled = np.zeros((len(texts), vectors.shape[1]), dtype=np.float32)
+    np.add.at(pooled, owners, vectors * weights)
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return pooled / norms
+
+
+# ✅ GPT 입력용 본문 축약: 공백 정리 → 예산 초과 시에만 중복/상용구 줄 제거 → 그래도 넘으면 앞부분 위주로 자르기
+# 상용구는 줄 전체가 일치할 때만 지운다 ("전자서명 인증 시스템", "개인정보보호 업무", "학점 3.8 / 4" 같은 본문은 유지)
+# 쪽 번호("page 3", "3 / 10") / 개인정보 수집·이용 동의 문구 / 사실 확인 문구 / 서명란("지원자: 홍길동 (서명)")
+BOILERPLATE = re.compile(
+    r"\s*(?:"
+    r"(?:page\s*)?\d+\s*(?:/|of)\s*\d+|page\s*\d+"
+    r"|(?:본인은\s*)?(?:위\s*)?개인정보[^.]*(?:수집|이용|제공)[^.]*동의(?:합니다|함)?\.?"
+    r"|(?:위|상기)\s*(?:기재\s*)?(?:사항|내용)[^.]*사실과\s*(?:다름|틀림)[^.]*\.?"
+    r"|(?:(?:지원자|작성자|성명)\s*[:：]?\s*[가-힣A-Za-z ]{0,20})?\(?\s*(?:서명|인)\s*\)?"
+    r")\s*",
+    re.IGNORECASE,
+)
+
+
+def trim_to_budget(text, budget=3000, model="gpt-4"):
+    if not isinstance(text, str):
+        return ""
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    lines = [line for line in lines if line]
+    cleaned = "\n".join(lines)
+    enc = _encoding(model)
+    if not enc:
+        # tiktoken이 없으면 한글 추정 오차를 감안해 예산의 절반만 사용 (split_tokens와 같은 기준)
+        budget //= 2
+    if count_tokens(cleaned, model) <= budget:
+        return cleaned
+
+    seen = set()
+    kept = []
+    for line in lines:
+        if line in seen or BOILERPLATE.fullmatch(line):
+            continue
+        seen.add(line)
+        kept.append(line)
+    cleaned = "\n".join(kept)
+    if count_tokens(cleaned, model) <= budget:
+        return cleaned
+
+    # 앞부분(경력 요약)을 더 많이, 끝부분(최근 이력/자격)을 조금 남긴다
+    if enc:
+        tokens = enc.encode(cleaned, disallowed_special=())
+        head, tail = int(budget * 0.75), budget - int(budget * 0.75) - 5
+        return enc.decode(tokens[:head]) + "\n…\n" + enc.decode(tokens[-tail:])
+    ratio = budget / count_tokens(cleaned, model)
+    limit = int(len(cleaned) * ratio)
+    head = int(limit * 0.75)
+    return cleaned[:head] + "\n…\n" + cleaned[len(cleaned) - (limit - head):]
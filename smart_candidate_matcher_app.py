@@ -1,10 +1,14 @@
 import streamlit as st
 from openai import OpenAI
-import pandas as pd
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-import matplotlib.pyplot as plt
-import json
+from embedding_batch import EMBED_MODEL
+from candidate_store import CandidateStore
+from llm_cache import LLMCache
+from gpt_scheduler import run_bounded
+from structured_output import ParseStats
+from candidate_analysis import profile_resume
+from stage_metrics import MetricsRecorder, render_sidebar
+from text_ingest import iter_csv_column, text_lengths
 
 # --- Configuration ---
 st.set_page_config(page_title='스마트 후보 매칭 대시보드', layout='wide')
@@ -35,6 +39,38 @@ if not api_key:
     st.stop()
 client = OpenAI(api_key=api_key)
 
+@st.cache_resource
+def get_store():
+    return CandidateStore()
+
+@st.cache_resource
+def get_llm_cache():
+    return LLMCache()
+
+store = get_store()
+llm_cache = get_llm_cache()
+if 'metrics' not in st.session_state:
+    st.session_state.metrics = MetricsRecorder()
+metrics = st.session_state.metrics
+if 'parse_stats' not in st.session_state:
+    st.session_state.parse_stats = ParseStats()
+parse_stats = st.session_state.parse_stats
+
+# 이력서 1건 GPT 프로필 (같은 이력서는 LLM 캐시에서 즉시 반환)
+def profile_candidate(row, src):
+    with metrics.stage('gpt_features', src) as span:
+        return profile_resume(client, llm_cache, store.text(row), budget=gpt_budget, on_usage=span.usage, stats=parse_stats)
+st.sidebar.caption(f'💾 저장된 후보 풀: {len(store):,}명')
+pool_mode = st.sidebar.checkbox('저장된 후보 풀 전체에서 매칭', value=False)
+pool_k = st.sidebar.number_input('풀 매칭 상위 K명', min_value=1, max_value=10000, value=50, step=10)
+csv_engine = st.sidebar.selectbox('CSV 읽기 엔진', ['pandas', 'pyarrow'])
+csv_chunksize = st.sidebar.number_input('CSV 청크 크기 (행)', min_value=500, max_value=100000, value=5000, step=500,
+                                        help='pyarrow 엔진은 평균 행 크기로 환산한 바이트 블록 단위로 읽으므로 청크당 행 수가 근삿값입니다.')
+gpt_budget = st.sidebar.number_input('GPT 입력 토큰 예산 (이력서당)', min_value=500, max_value=7000, value=3000, step=500)
+cascade = st.sidebar.checkbox('캐스케이드 모드 (유사도 상위만 GPT 프로파일링)', value=True)
+profile_k = st.sidebar.number_input('GPT 프로파일링 상위 K명', min_value=1, max_value=1000, value=10, disabled=not cascade)
+profile_threshold = st.sidebar.slider('유사도 임계값 (이상이면 K명 밖이어도 포함, 0 = 사용 안 함)', 0.0, 1.0, 0.0, 0.01, disabled=not cascade)
+
 # Header
 st.markdown('<div class="glass"><h1 style="font-size:32px; margin:0;"><i class="fas fa-user-tie" style="color:#4f46e5;"></i> 스마트 후보 매칭 대시보드</h1><p style="margin:0; opacity:0.7;">AI 기반 통합 지원자 분석 및 매칭</p></div>', unsafe_allow_html=True)
 
@@ -42,47 +78,84 @@ st.markdown('<div class="glass"><h1 style="font-size:32px; margin:0;"><i class="
 st.markdown('<div class="glass"><h2>1. 이력서 업로드 및 JD 입력</h2></div>', unsafe_allow_html=True)
 files = st.file_uploader('이력서를 TXT 또는 CSV로 업로드하세요 (다중 선택 가능)', type=['txt','csv'], accept_multiple_files=True)
 jd = st.text_area('직무기술서(JD)를 입력하세요', height=150)
+
+# CSV 텍스트 컬럼은 헤더만 읽어 한 번 선택
+csv_cols = {}
+for f in files or []:
+    if f.name.lower().endswith('.csv'):
+        import pandas as pd
+        csv_cols[f.name] = st.selectbox(f'CSV 컬럼 선택: {f.name}', pd.read_csv(f, nrows=0).columns, key=f'col_{f.name}')
+        f.seek(0)
 run = st.button('🚀 분석 시작')
 
-if files and jd and run:
-    # Read resumes
-    resumes = []
-    for f in files:
+if (files or pool_mode) and jd and run:
+    import pandas as pd
+
+    # Read resumes chunk by chunk; each chunk goes straight into the embedding store
+    progress = st.progress(0)
+    status = st.empty()
+    metrics.reset()
+    with metrics.stage('jd_embedding') as span:
+        jd_res = client.embeddings.create(input=jd, model=EMBED_MODEL)
+        span.usage(EMBED_MODEL, jd_res.usage)
+    jd_emb = jd_res.data[0].embedding
+    row_parts, char_parts, word_parts = [], [], []
+    for fi, f in enumerate(files or []):
         if f.name.lower().endswith('.csv'):
-            df_csv = pd.read_csv(f)
-            col = st.selectbox(f'CSV 컬럼 선택: {f.name}', df_csv.columns)
-            for _, r in df_csv.iterrows():
-                resumes.append({'text': r[col], 'src': f.name})
+            chunks = iter_csv_column(f, csv_cols[f.name], chunksize=int(csv_chunksize), engine=csv_engine)
         else:
-            text = f.getvalue().decode('utf-8', errors='ignore')
-            resumes.append({'text': text, 'src': f.name})
-    df = pd.DataFrame(resumes)
-    n = len(df)
-    df['chars'] = df['text'].str.len()
-    df['words'] = df['text'].str.split().str.len()
-
-    # Compute embeddings and features
-    jd_emb = client.embeddings.create(input=jd, model='text-embedding-ada-002').data[0].embedding
-    sims = []
-    feats = []
+            chunks = [pd.Series([f.getvalue().decode('utf-8', errors='ignore')])]
+        for chunk in chunks:
+            with metrics.stage('embedding', f.name) as span:
+                row_parts.append(store.add(client, chunk.tolist(), [f.name] * len(chunk), on_usage=span.usage))
+            chars, words = text_lengths(chunk)
+            char_parts.append(chars)
+            word_parts.append(words)
+            status.caption(f'{f.name}: {sum(len(r) for r in row_parts):,}건 처리')
+        progress.progress((fi + 1) / len(files))
+
+    # Compute similarities (only new resumes hit the embedding API)
+    if pool_mode:
+        rows, scores = store.top_k(jd_emb, k=int(pool_k))
+        chars, words = text_lengths([store.text(i) for i in rows])
+    else:
+        rows = np.concatenate(row_parts) if row_parts else np.zeros(0, dtype=np.int64)
+        scores = store.scores(jd_emb, rows)
+        chars = np.concatenate(char_parts) if char_parts else np.zeros(0)
+        words = np.concatenate(word_parts) if word_parts else np.zeros(0)
+    if len(rows) == 0:
+        st.warning('매칭할 이력서가 없습니다.')
+        st.stop()
+    df = pd.DataFrame({'row': rows, 'src': [store.meta[i]['src'] for i in rows], 'chars': chars, 'words': words})
+    df['sim'] = np.round(np.asarray(scores, dtype=float), 3)
+    df = df.sort_values('sim', ascending=False, kind='stable').reset_index(drop=True)
+
+    # 캐스케이드: 임베딩 유사도로 전체를 정렬한 뒤 상위 K명(+ 임계값 이상)만 GPT 프로파일링, 나머지는 열람 시 생성
+    if cascade:
+        targets = df.index[(df.index < int(profile_k)) | ((profile_threshold > 0) & (df['sim'] >= profile_threshold))]
+    else:
+        targets = df.index
+    profiles = {}
     progress = st.progress(0)
-    for i, row in df.iterrows():
-        emb = client.embeddings.create(input=row['text'], model='text-embedding-ada-002').data[0].embedding
-        sims.append(cosine_similarity([jd_emb], [emb])[0][0])
-        resp = client.chat.completions.create(
-            model='gpt-4',
-            messages=[{
-                'role': 'user',
-                'content': f"이 이력서의 핵심 역량, 경험 키워드, 소프트 스킬 3가지를 JSON으로 요약:\n{row['text']}"
-            }]
-        )
-        try:
-            feats.append(json.loads(resp.choices[0].message.content))
-        except:
-            feats.append({})
-        progress.progress((i+1) / n)
-
-    df['sim'] = np.round(sims, 3)
+    status.caption(f'GPT 프로파일링 {len(targets):,} / {len(df):,}명')
+    jobs = [(int(df.at[i, 'row']), df.at[i, 'src']) for i in targets]
+    for done, (j, feat, err) in enumerate(run_bounded(jobs, lambda job: profile_candidate(*job), max_workers=4), 1):
+        if err:
+            st.error(f'{jobs[j][1]} 프로파일링 실패: {err}')
+        else:
+            profiles[jobs[j][0]] = feat
+        progress.progress(done / len(jobs))
+    st.session_state.match = df
+    st.session_state.profiles = profiles
+    stats = llm_cache.stats()
+    st.sidebar.caption(f"🗄️ GPT 캐시 적중 {stats['hits_memory'] + stats['hits_disk']} / 미적중 {stats['misses']}")
+    parsing = parse_stats.stats()
+    st.sidebar.caption(f"🧩 JSON 파싱 성공률 {parsing['parse_success']:.0%} (로컬 복구 {parsing['repaired']} / 재질의 {parsing['requeried']} / 실패 {parsing['failed']})")
+
+# 매칭 결과는 세션에 보관해 후보 프로필을 열람할 때(리런) 다시 계산하지 않는다
+df = st.session_state.get('match')
+if df is not None:
+    profiles = st.session_state.profiles
     avg_sim = np.round(df['sim'].mean(), 3)
     max_sim = np.round(df['sim'].max(), 3)
     pct_80 = np.round((df['sim'] >= 0.8).mean() * 100, 1)
@@ -94,11 +167,14 @@ if files and jd and run:
     kpicol3.markdown(f"<div class='kpi-card' style='background:linear-gradient(45deg, #93c5fd, #1e40af);'><div class='kpi-title'>80% 이상 비율</div><div class='kpi-value'>{pct_80}%</div><div class='progress-bar'><div class='progress-bar-fill' style='width:{pct_80}%;'></div></div></div>", unsafe_allow_html=True)
 
     # Tabs for detailed views
-    tab1, tab2, tab3 = st.tabs(['📊 지원자 개요', '📈 시각화', '🔍 상위 1명 프로필'])
+    tab1, tab2, tab3 = st.tabs(['📊 지원자 개요', '📈 시각화', '🔍 후보 프로필'])
     with tab1:
         st.subheader('지원자 상위 10명')
-        st.dataframe(df[['src', 'chars', 'words', 'sim']].sort_values('sim', ascending=False).head(10))
+        top10 = df.head(10).assign(프로필=lambda d: d['row'].map(lambda r: '✅' if r in profiles else '-'))
+        st.dataframe(top10[['src', 'chars', 'words', 'sim', '프로필']])
     with tab2:
+        import matplotlib.pyplot as plt
+
         st.subheader('유사도 분포')
         fig1, ax1 = plt.subplots()
         ax1.hist(df['sim'], bins=20, color='#4f46e5')
@@ -114,5 +190,15 @@ if files and jd and run:
         ax3.invert_yaxis()
         st.pyplot(fig3)
     with tab3:
-        st.subheader('최고 유사도 지원자 분석')
-        st.json(feats[np.argmax(sims)])
+        st.subheader('지원자 프로필')
+        candidates = df.head(200)
+        pick = st.selectbox('지원자 선택 (유사도 상위 200명)', candidates.index,
+                            format_func=lambda i: f"{i + 1}. {candidates.at[i, 'src']} #{candidates.at[i, 'row']} (유사도 {candidates.at[i, 'sim']})")
+        row = int(candidates.at[pick, 'row'])
+        if row not in profiles:
+            with st.spinner('GPT 프로필 생성 중...'):
+                profiles[row] = profile_candidate(row, candidates.at[pick, 'src'])
+        st.json(profiles[row])
+        st.caption(f'GPT 프로필 {len(profiles):,} / {len(df):,}명 생성됨 · 프로필이 없는 지원자는 선택할 때 생성')
+
+render_sidebar(metrics)
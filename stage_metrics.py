@@ -0,0 +1,166 @@
+# 단계별 계측
+# 단계(추출, GPT, 워드클라우드, 차트 등)와 후보자 단위로 소요 시간, 토큰 사용량, 예상 비용을 기록하고
+# 사이드바 요약과 JSON lines / Prometheus 텍스트 형식으로 내보낸다.
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 1K 토큰당 USD (입력, 출력) — 가격 변경 시 여기만 수정
+PRICING = {
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4": (0.03, 0.06),
+    "text-embedding-ada-002": (0.0001, 0.0),
+}
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    price_in, price_out = PRICING.get(model, (0.0, 0.0))
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1000
+
+
+def _usage_value(usage, name):
+    if isinstance(usage, dict):
+        return usage.get(name) or 0
+    return getattr(usage, name, 0) or 0
+
+
+class _Span:
+    def __init__(self, stage, candidate):
+        self.stage = stage
+        self.candidate = candidate
+        self.model = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    # API 응답의 usage를 누적 (cached_chat/embed_texts의 on_usage 콜백으로 전달)
+    def usage(self, model, usage):
+        prompt_tokens = _usage_value(usage, "prompt_tokens")
+        completion_tokens = _usage_value(usage, "completion_tokens")
+        with self._lock:
+            self.model = model
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost += estimate_cost(model, prompt_tokens, completion_tokens)
+
+    def as_dict(self):
+        return {
+            "ts": time.time(),
+            "stage": self.stage,
+            "candidate": self.candidate,
+            "seconds": round(self.seconds, 4),
+            "model": self.model,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost, 6),
+        }
+
+
+def _accumulate(totals, r):
+    t = totals.setdefault(r["stage"], {"calls": 0, "seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0})
+    t["calls"] += 1
+    t["seconds"] += r["seconds"]
+    t["prompt_tokens"] += r["prompt_tokens"]
+    t["completion_tokens"] += r["completion_tokens"]
+    t["cost_usd"] += r["cost_usd"]
+
+
+class MetricsRecorder:
+    def __init__(self, export_path=None):
+        self.records = []
+        # reset()과 무관하게 계속 증가하는 누적 합계 (Prometheus counter용)
+        self.totals = {}
+        self.export_path = export_path or os.environ.get("HR_METRICS_PATH")
+        self._lock = threading.Lock()
+
+    # ✅ 단계 구간 측정: with metrics.stage("gpt", 파일명) as span: ... span.usage(model, usage)
+    @contextmanager
+    def stage(self, name, candidate=None):
+        span = _Span(name, candidate)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.seconds = time.perf_counter() - start
+            self.add(span.as_dict())
+
+    # 이미 측정된 시간을 기록 (예: 추출 워커가 보고한 파일별 소요 시간)
+    def record(self, name, candidate=None, seconds=0.0):
+        span = _Span(name, candidate)
+        span.seconds = seconds
+        self.add(span.as_dict())
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+            _accumulate(self.totals, record)
+            if self.export_path:
+                with open(self.export_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    # stages를 주면 해당 단계 기록만 지운다 (리런마다 다시 그리는 리포트 단계 등, 누적 합계는 유지)
+    def reset(self, stages=None):
+        with self._lock:
+            self.records = [r for r in self.records if stages is not None and r["stage"] not in stages]
+
+    # ✅ 단계별 합계 {stage: {calls, seconds, prompt_tokens, completion_tokens, cost_usd}}
+    # cumulative=False면 마지막 reset 이후(현재 실행) 기록, True면 세션 시작 이후 누적
+    def summary(self, cumulative=False):
+        totals = {}
+        with self._lock:
+            if cumulative:
+                totals = {stage: dict(t) for stage, t in self.totals.items()}
+            else:
+                for r in self.records:
+                    _accumulate(totals, r)
+        for t in totals.values():
+            t["seconds"] = round(t["seconds"], 3)
+            t["cost_usd"] = round(t["cost_usd"], 4)
+        return totals
+
+    def to_jsonl(self):
+        with self._lock:
+            return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self.records)
+
+    # counter는 줄어들면 안 되므로 reset()과 무관한 누적 합계를 내보낸다
+    def to_prometheus(self, prefix="hr"):
+        lines = []
+        metrics = [
+            ("stage_calls_total", "calls", "단계 실행 횟수"),
+            ("stage_seconds_total", "seconds", "단계 누적 소요 시간(초)"),
+            ("stage_prompt_tokens_total", "prompt_tokens", "입력 토큰 수"),
+            ("stage_completion_tokens_total", "completion_tokens", "출력 토큰 수"),
+            ("stage_cost_usd_total", "cost_usd", "예상 비용(USD)"),
+        ]
+        summary = self.summary(cumulative=True)
+        for name, key, help_text in metrics:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for stage, t in summary.items():
+                lines.append(f'{prefix}_{name}{{stage="{stage}"}} {t[key]}')
+        return "\n".join(lines) + "\n"
+
+
+# ✅ 사이드바 요약 패널 + 내보내기 버튼
+def render_sidebar(metrics, key="metrics"):
+    import streamlit as st
+
+    summary = metrics.summary()
+    if not summary:
+        return
+    st.sidebar.subheader("⏱️ 단계별 계측")
+    st.sidebar.dataframe(
+        [{"단계": stage, "호출": t["calls"], "시간(s)": t["seconds"], "토큰": t["prompt_tokens"] + t["completion_tokens"], "비용($)": t["cost_usd"]}
+         for stage, t in summary.items()],
+        hide_index=True,
+    )
+    total_cost = sum(t["cost_usd"] for t in summary.values())
+    st.sidebar.caption(f"예상 비용 합계: ${total_cost:.4f}")
+    st.sidebar.download_button("📤 JSON lines", metrics.to_jsonl(), file_name="metrics.jsonl", key=f"{key}_jsonl")
+    st.sidebar.download_button("📤 Prometheus", metrics.to_prometheus(), file_name="metrics.prom", key=f"{key}_prom")
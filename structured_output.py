@@ -0,0 +1,249 @@
+# 스키마 기반 JSON 추출
+# GPT 응답을 타입이 정해진 스키마로 받아 검증하고, 흔한 형식 오류(코드 펜스, 끝 쉼표, 누락 키)는 로컬에서 고친다.
+# 그래도 누락됐거나 타입이 맞지 않거나 빈 문자열인 항목만 골라 한 번 더 물어보고, 끝까지 실패한 항목은 기본값으로 채운다.
+# 빈 목록(예: 우려사항 없음)은 정상 응답으로 보고 다시 묻지 않는다.
+#
+# 스키마 표기: str / int / float / [타입] (목록) / {"키": 타입, ...} (객체)
+
+import json
+import re
+import threading
+
+from llm_cache import cached_chat
+
+# json_schema(strict) 응답 형식을 지원하는 모델 접두어 / json_object만 지원하는 모델 접두어
+JSON_SCHEMA_MODELS = ("gpt-4o", "gpt-4.1", "o1", "o3", "o4")
+JSON_OBJECT_MODELS = ("gpt-4-turbo", "gpt-3.5-turbo")
+
+
+# ✅ 스키마 → JSON Schema (strict 모드: 모든 키 필수, 추가 키 금지)
+def json_schema(schema):
+    if isinstance(schema, dict):
+        return {
+            "type": "object",
+            "properties": {k: json_schema(v) for k, v in schema.items()},
+            "required": list(schema),
+            "additionalProperties": False,
+        }
+    if isinstance(schema, list):
+        return {"type": "array", "items": json_schema(schema[0])}
+    return {"type": {str: "string", int: "integer", float: "number", bool: "boolean"}[schema]}
+
+
+# 모델이 지원하는 가장 엄격한 response_format (미지원 모델은 None → 프롬프트 지시만 사용)
+def response_format(model, schema, name="result"):
+    if model.startswith(JSON_SCHEMA_MODELS):
+        return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": json_schema(schema)}}
+    if model.startswith(JSON_OBJECT_MODELS):
+        return {"type": "json_object"}
+    return None
+
+
+def default_value(schema):
+    if isinstance(schema, dict):
+        return {k: default_value(v) for k, v in schema.items()}
+    if isinstance(schema, list):
+        return []
+    return schema()
+
+
+# ✅ 로컬 복구: 코드 펜스 제거 → 바깥쪽 {...}만 추출 → 그대로 파싱 → 실패 시 문자열 밖에서만 끝 쉼표/파이썬 리터럴/잘린 괄호 정리
+# max_tokens로 잘린 응답은 닫히지 않은 [ / { 를 역순으로 닫아 앞부분이라도 살린다
+FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+STRING = re.compile(r'("(?:\\.|[^"\\])*")')
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def _loads_object(text):
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("JSON 객체가 아님")
+    return data
+
+
+def _fix_outside_strings(text):
+    # 짝수 번째 조각은 문자열 밖, 홀수 번째 조각은 문자열 리터럴 (리터럴 안의 "True", ", ]" 등은 건드리지 않음)
+    parts = STRING.split(text)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r"\b(True|False|None)\b", lambda m: LITERALS[m.group(1)], parts[i])
+    # 닫는 괄호가 잘린 응답은 열린 괄호를 스택으로 추적해 안쪽부터 닫는다
+    stack = []
+    for i in range(0, len(parts), 2):
+        for ch in parts[i]:
+            if ch in "{[":
+                stack.append("}" if ch == "{" else "]")
+            elif ch in "}]" and stack:
+                stack.pop()
+    if stack:
+        parts[-1] = parts[-1].rstrip().rstrip(",").rstrip() + "".join(reversed(stack))
+    for i in range(0, len(parts), 2):
+        parts[i] = TRAILING_COMMA.sub(r"\1", parts[i])
+    return "".join(parts)
+
+
+def repair_json(content):
+    if not isinstance(content, str):
+        raise ValueError("응답이 비어 있음")
+    try:
+        return _loads_object(content), False
+    except ValueError:
+        pass
+
+    fenced = FENCE.search(content)
+    text = fenced.group(1) if fenced else content
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1:
+        raise ValueError("JSON 객체를 찾을 수 없음")
+    tail = text[start:]
+    text = text[start:end + 1] if end > start else tail
+    try:
+        return _loads_object(text), True
+    except ValueError:
+        pass
+    # 잘린 응답은 마지막 } 뒤에도 내용이 남아 있으므로 끝까지 포함해 먼저 고쳐 보고, 안 되면 {...} 범위만 고친다
+    error = None
+    for candidate in dict.fromkeys([tail, text]):
+        try:
+            return _loads_object(_fix_outside_strings(candidate)), True
+        except ValueError as e:
+            error = e
+    raise ValueError(f"JSON 파싱 실패: {error}")
+
+
+def _coerce(value, schema):
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            raise TypeError
+        return {k: _coerce(value[k], v) for k, v in schema.items()}
+    if isinstance(schema, list):
+        if isinstance(value, str):
+            value = [v.strip() for v in re.split(r"[,\n·]", value) if v.strip()]
+        if not isinstance(value, list):
+            raise TypeError
+        return [_coerce(v, schema[0]) for v in value]
+    if schema is str:
+        if isinstance(value, list):
+            return ", ".join(str(v) for v in value)
+        if value is None or isinstance(value, dict):
+            raise TypeError
+        return str(value)
+    if schema in (int, float):
+        if isinstance(value, str):
+            # "85점", "85/100" 같은 응답에서 첫 숫자만 사용
+            match = re.search(r"-?\d+(?:\.\d+)?", value)
+            if not match:
+                raise TypeError
+            value = match.group()
+        return schema(float(value))
+    return schema(value)
+
+
+# ✅ 검증: 스키마 타입으로 변환하고, 누락/변환 실패/빈 문자열 항목은 기본값으로 채워 목록으로 돌려준다
+# 객체 필드는 하위 키 단위로 검사하므로 "역량별 평가 코멘트.협업/커뮤니케이션"처럼 경로로 표시된다
+def validate(data, schema, prefix=""):
+    clean, failed = {}, []
+    for key, sub in schema.items():
+        path = prefix + key
+        if isinstance(sub, dict) and isinstance(data.get(key), dict):
+            clean[key], sub_failed = validate(data[key], sub, path + ".")
+            failed.extend(sub_failed)
+            continue
+        try:
+            clean[key] = _coerce(data[key], sub)
+            if sub is str and not clean[key].strip():
+                raise ValueError
+        except (KeyError, TypeError, ValueError):
+            clean[key] = default_value(sub)
+            failed.append(path)
+    return clean, failed
+
+
+def _subschema(schema, paths):
+    sub = {}
+    for path in paths:
+        top, _, rest = path.partition(".")
+        if rest:
+            sub.setdefault(top, {})[rest] = schema[top][rest]
+        else:
+            sub[top] = schema[top]
+    return sub
+
+
+def _merge(base, patch):
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+# 프롬프트에 넣을 형식 예시 (response_format을 지원하지 않는 모델용)
+def example_json(schema):
+    return json.dumps(default_value(schema), ensure_ascii=False)
+
+
+class ParseStats:
+    def __init__(self):
+        self.ok = 0          # 첫 응답이 그대로 유효
+        self.repaired = 0    # 로컬 복구만으로 유효
+        self.requeried = 0   # 실패 항목 재질의 후 유효
+        self.failed = 0      # 기본값으로 채운 항목이 남음
+        self._lock = threading.Lock()
+
+    def add(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    # ✅ 파싱 성공률 = 첫 응답(로컬 복구 포함)으로 모든 항목을 얻은 비율
+    def stats(self):
+        with self._lock:
+            total = self.ok + self.repaired + self.requeried + self.failed
+            return {
+                "total": total,
+                "ok": self.ok,
+                "repaired": self.repaired,
+                "requeried": self.requeried,
+                "failed": self.failed,
+                "parse_success": (self.ok + self.repaired) / total if total else 0.0,
+            }
+
+
+def _ask(client, cache, model, prompt, schema, name, on_usage, before_call):
+    fmt = response_format(model, schema, name)
+    params = {"response_format": fmt} if fmt else {}
+    return cached_chat(client, cache, model, [{"role": "user", "content": prompt}],
+                       on_usage=on_usage, before_call=before_call, **params)
+
+
+# ✅ 스키마 추출: 응답 형식 지정 호출 → 로컬 복구/검증 → 실패 항목만 재질의 (최대 retries회)
+# 반환값은 항상 스키마의 모든 키를 가진 dict
+def extract(client, cache, model, prompt, schema, name="result", on_usage=None, stats=None, retries=1, before_call=None):
+    content = _ask(client, cache, model, prompt, schema, name, on_usage, before_call)
+    try:
+        data, repaired = repair_json(content)
+    except ValueError:
+        data, repaired = {}, True
+    result, failed = validate(data, schema)
+    outcome = "repaired" if repaired else "ok"
+
+    for _ in range(retries):
+        if not failed:
+            break
+        outcome = "requeried"
+        sub = _subschema(schema, failed)
+        retry_prompt = f"{prompt}\n\n아래 항목만 다시 작성해줘. 설명 없이 이 형식의 JSON 객체로만 답해:\n{example_json(sub)}"
+        content = _ask(client, cache, model, retry_prompt, sub, name, on_usage, before_call)
+        try:
+            patch, _ = repair_json(content)
+        except ValueError:
+            continue
+        patch, failed = validate(patch, sub)
+        _merge(result, patch)
+
+    if failed:
+        outcome = "failed"
+    if stats is not None:
+        stats.add(outcome)
+    return result
@@ -0,0 +1,141 @@
+# 대규모 설문 분석 엔진
+# 응답 1행 = 1건 단위로 감정 점수를 병렬 배치로 계산하고(응답별 캐시로 신규 응답만 처리),
+# 희소 행렬 기반 키워드 빈도와 부서/문항별 집계를 만든다.
+
+import hashlib
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+from gpt_scheduler import run_bounded
+
+# 한국어 조사/어미를 떼어 내고 2글자 이상 단어만 키워드로 사용
+JOSA = re.compile(r"(으로|에서|에게|까지|부터|보다|처럼|이나|이랑|하고|은|는|이|가|을|를|에|의|도|로|와|과|만)$")
+STOPWORDS = {"그리고", "하지만", "그래서", "너무", "정말", "조금", "있습니다", "합니다", "같습니다", "생각", "부분", "회사", "우리"}
+
+POSITIVE = ["좋", "만족", "감사", "훌륭", "행복", "즐겁", "편하", "성장", "배려", "존중", "칭찬", "개선되", "최고", "원활"]
+NEGATIVE = ["불만", "부족", "힘들", "어렵", "나쁘", "싫", "스트레스", "야근", "불공정", "답답", "불편", "과도", "소통이 안", "최악", "퇴사"]
+
+
+def _tokenize(text):
+    words = []
+    for word in re.findall(r"[가-힣A-Za-z]{2,}", text):
+        word = JOSA.sub("", word)
+        if len(word) >= 2 and word not in STOPWORDS:
+            words.append(word)
+    return words
+
+
+# ✅ 사전 기반 감정 점수 (-1 ~ 1, API 없이 즉시 계산)
+def lexicon_sentiment(texts):
+    scores = []
+    for text in texts:
+        pos = sum(text.count(w) for w in POSITIVE)
+        neg = sum(text.count(w) for w in NEGATIVE)
+        scores.append((pos - neg) / (pos + neg) if pos + neg else 0.0)
+    return np.asarray(scores, dtype=float)
+
+
+# 프롬프트/점수 기준을 바꾸면 올려서 이전 점수가 재사용되지 않게 한다
+PROMPT_VERSION = 1
+
+
+def _sentiment_key(text, model):
+    raw = f"survey-sentiment\x00v{PROMPT_VERSION}\x00{model}\x00{text}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _gpt_batch(ask, batch, model):
+    numbered = "\n".join(f"{i + 1}. {' '.join(t.split())[:500]}" for i, t in enumerate(batch))
+    prompt = (
+        f"다음 사내 설문 응답 {len(batch)}건 각각의 감정을 -1(매우 부정)부터 1(매우 긍정) 사이 실수로 평가해줘. "
+        f"설명 없이 길이 {len(batch)}인 JSON 숫자 배열로만 답해:\n{numbered}"
+    )
+    content = ask(prompt, model=model)
+    scores = json.loads(content[content.find("["):content.rfind("]") + 1])
+    if len(scores) != len(batch):
+        raise ValueError(f"응답 수 불일치: {len(scores)} != {len(batch)}")
+    return [float(np.clip(s, -1, 1)) for s in scores]
+
+
+# ✅ 응답별 감정 점수: 캐시에 없는 응답만 배치로 묶어 병렬 요청 → (점수 배열, 신규 처리 건수, 사전 대체 건수)
+# ask(prompt, model=...)가 없거나 배치가 실패하면 해당 응답은 사전 기반 점수로 대체한다 (대체 점수는 캐시하지 않음)
+# cache는 응답 단위로 항목이 많으므로 GPT 응답 캐시와 분리된 LLMCache를 넘긴다
+def score_sentiment(texts, ask=None, cache=None, model="gpt-4o", batch_size=50, max_workers=4, on_progress=None):
+    texts = [t if isinstance(t, str) else "" for t in texts]
+    scores = np.zeros(len(texts))
+    pending = {}
+    for i, text in enumerate(texts):
+        cached = cache.get(_sentiment_key(text, model)) if cache is not None else None
+        if cached is not None:
+            scores[i] = float(cached)
+        else:
+            pending.setdefault(text, []).append(i)
+
+    unique = list(pending)
+    if not unique:
+        return scores, 0, 0
+    if ask is None:
+        fresh = lexicon_sentiment(unique)
+        for text, score in zip(unique, fresh):
+            scores[pending[text]] = score
+        return scores, len(unique), 0
+
+    fallback = 0
+    batches = [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+    for done, (b, batch_scores, err) in enumerate(run_bounded(batches, lambda batch: _gpt_batch(ask, batch, model), max_workers=max_workers), 1):
+        batch = batches[b]
+        if err:
+            batch_scores = lexicon_sentiment(batch)
+            fallback += len(batch)
+        elif cache is not None:
+            for text, score in zip(batch, batch_scores):
+                cache.set(_sentiment_key(text, model), str(score))
+        for text, score in zip(batch, batch_scores):
+            scores[pending[text]] = score
+        if on_progress:
+            on_progress(done, len(batches))
+    return scores, len(unique) - fallback, fallback
+
+
+# ✅ 키워드 빈도 (희소 행렬) → (전체 빈도 Series, {그룹 컬럼: 그룹×단어 상위 빈도 DataFrame})
+def keyword_frequencies(df, text_col, group_cols=(), top_n=15, min_df=2):
+    from scipy.sparse import csr_matrix
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    texts = df[text_col].fillna("").astype(str)
+    vectorizer = CountVectorizer(tokenizer=_tokenize, lowercase=False, token_pattern=None, min_df=min(min_df, len(texts)))
+    try:
+        X = vectorizer.fit_transform(texts)
+    except ValueError:  # 어휘가 비어 있음
+        return pd.Series(dtype=int), {}
+    vocab = vectorizer.get_feature_names_out()
+    overall = pd.Series(np.asarray(X.sum(axis=0)).ravel(), index=vocab).nlargest(top_n)
+
+    by_group = {}
+    for col in group_cols:
+        codes, labels = pd.factorize(df[col].fillna("(미기재)"))
+        # 그룹 지시 행렬(그룹×응답) @ X(응답×단어) = 그룹×단어 빈도
+        indicator = csr_matrix((np.ones(len(codes)), (codes, np.arange(len(codes)))), shape=(len(labels), len(codes)))
+        counts = (indicator @ X).toarray()
+        top = {}
+        for g, label in enumerate(labels):
+            idx = np.argsort(-counts[g])[:top_n]
+            top[label] = [f"{vocab[j]}({int(counts[g, j])})" for j in idx if counts[g, j] > 0]
+        by_group[col] = pd.DataFrame({k: pd.Series(v, dtype=object) for k, v in top.items()})
+    return overall, by_group
+
+
+# ✅ 그룹별 집계 (응답 수, 평균 감정, 긍정/부정 비율)
+def group_summary(df, group_col, score_col="감정 점수"):
+    key = df[group_col].fillna("(미기재)")
+    scores = df[score_col]
+    summary = pd.DataFrame({
+        "응답 수": scores.groupby(key).size(),
+        "평균 감정": scores.groupby(key).mean().round(3),
+        "긍정 비율(%)": ((scores > 0.2).groupby(key).mean() * 100).round(1),
+        "부정 비율(%)": ((scores < -0.2).groupby(key).mean() * 100).round(1),
+    })
+    return summary.sort_values("평균 감정")
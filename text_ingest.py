@@ -0,0 +1,182 @@
+# 이력서/자기소개서 텍스트 추출
+# 여러 PDF를 프로세스 풀에서 병렬로 추출하고, 파일 내용 해시로 추출 결과를 캐시한다.
+# 파일별 소요 시간과 페이지 수를 함께 돌려준다.
+
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+CACHE_DIR = os.environ.get("HR_TEXT_CACHE", ".text_cache")
+# 메모리에는 최근 추출 결과만 LRU로 보관 (나머지는 디스크 캐시에서 다시 읽음)
+MAX_MEMORY_ITEMS = 256
+_memory = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _is_pdf(name, data):
+    return name.lower().endswith(".pdf") or data[:5] == b"%PDF-"
+
+
+# ✅ 단일 파일 추출 (프로세스 풀 워커에서도 실행되므로 모듈 최상위 함수로 유지)
+def extract_bytes(name, data):
+    start = time.perf_counter()
+    if _is_pdf(name, data):
+        import PyPDF2
+
+        reader = PyPDF2.PdfReader(BytesIO(data))
+        pages = [page.extract_text() or "" for page in reader.pages]
+        text = "\n".join(pages)
+        page_count = len(pages)
+    else:
+        text = data.decode("utf-8", errors="ignore")
+        page_count = 1
+    return {"text": text, "pages": page_count, "seconds": round(time.perf_counter() - start, 4)}
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def _remember(key, entry):
+    with _memory_lock:
+        _memory[key] = entry
+        _memory.move_to_end(key)
+        while len(_memory) > MAX_MEMORY_ITEMS:
+            _memory.popitem(last=False)
+
+
+def _load_cached(key):
+    with _memory_lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            _memory.move_to_end(key)
+            return entry
+    try:
+        with open(_cache_path(key), encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _remember(key, entry)
+    return entry
+
+
+def _store(key, entry):
+    _remember(key, entry)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{_cache_path(key)}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp, _cache_path(key))
+
+
+# 워커 프로세스는 최초 사용 시 한 번만 띄워 재사용 (spawn: Streamlit 스레드와 fork 충돌 방지)
+@functools.lru_cache(maxsize=1)
+def _pool(max_workers):
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+# ✅ 프로세스 풀 추출: 워커가 죽어(크래시/OOM) 풀이 깨지면 캐시된 풀을 버리고 남은 파일은 현재 프로세스에서 추출
+# 다음 업로드 때는 새 풀을 띄운다
+def _extract_pooled(pending, max_workers):
+    pool = _pool(max_workers)
+    try:
+        futures = [(i, name, data, key, pool.submit(extract_bytes, name, data)) for i, name, data, key in pending]
+    except BrokenProcessPool:
+        futures = [(i, name, data, key, None) for i, name, data, key in pending]
+    extracted = []
+    broken = False
+    for i, name, data, key, fut in futures:
+        try:
+            if fut is None:
+                raise BrokenProcessPool
+            entry = fut.result()
+        except BrokenProcessPool:
+            broken = True
+            entry = extract_bytes(name, data)
+        extracted.append((i, name, key, entry))
+    if broken:
+        _pool.cache_clear()
+        pool.shutdown(wait=False, cancel_futures=True)
+    return extracted
+
+
+# ✅ 여러 파일 추출: [(파일명, bytes)] → [{name, text, pages, seconds, cached}] (입력 순서 유지)
+def extract_many(files, max_workers=None, parallel_threshold=2):
+    max_workers = max_workers or min(4, os.cpu_count() or 1)
+    results = [None] * len(files)
+    pending = []
+    for i, (name, data) in enumerate(files):
+        key = hashlib.sha256(data).hexdigest()
+        entry = _load_cached(key)
+        if entry is not None:
+            results[i] = {"name": name, **entry, "seconds": 0.0, "cached": True}
+        else:
+            pending.append((i, name, data, key))
+
+    # PDF가 적으면 프로세스 간 전송 비용이 더 크므로 현재 프로세스에서 처리
+    pdf_count = sum(1 for _, name, data, _ in pending if _is_pdf(name, data))
+    if pdf_count >= parallel_threshold and max_workers > 1:
+        extracted = _extract_pooled(pending, max_workers)
+    else:
+        extracted = [(i, name, key, extract_bytes(name, data)) for i, name, data, key in pending]
+
+    for i, name, key, entry in extracted:
+        _store(key, {"text": entry["text"], "pages": entry["pages"]})
+        results[i] = {"name": name, **entry, "cached": False}
+    return results
+
+
+def extract_one(name, data):
+    return extract_many([(name, data)])[0]
+
+
+# 앞부분 1MB 샘플로 추정한 평균 행 크기(바이트)
+def _row_bytes(file, sample_size=1 << 20):
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            sample = f.read(sample_size)
+    else:
+        pos = file.tell()
+        sample = file.read(sample_size)
+        file.seek(pos)
+    return max(1, len(sample) // max(1, sample.count(b"\n")))
+
+
+# ✅ CSV 텍스트 컬럼 스트리밍 읽기 (청크 단위 Series 반환, pyarrow 엔진 선택 가능)
+# pyarrow는 바이트 단위 블록으로 읽으므로 chunksize 행 × 평균 행 크기로 블록 크기를 맞춘다 (청크당 행 수는 근삿값)
+def iter_csv_column(file, column, chunksize=5000, engine="pandas"):
+    # pandas/pyarrow는 PDF 추출 워커가 불러오지 않도록 여기서 import
+    import pandas as pd
+
+    if engine == "pyarrow":
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        block_size = max(1 << 16, chunksize * _row_bytes(file))
+        reader = pacsv.open_csv(
+            file,
+            read_options=pacsv.ReadOptions(block_size=block_size),
+            convert_options=pacsv.ConvertOptions(include_columns=[column], column_types={column: pa.string()}),
+        )
+        for batch in reader:
+            if batch.num_rows:
+                yield batch.column(0).to_pandas()
+        return
+    for chunk in pd.read_csv(file, usecols=[column], dtype={column: str}, chunksize=chunksize):
+        yield chunk[column]
+
+
+# ✅ 문자 수/단어 수 (벡터 연산, 리스트 생성 없이 계산)
+def text_lengths(texts):
+    import pandas as pd
+
+    texts = pd.Series(texts, dtype="object").fillna("").astype(str)
+    return texts.str.len().to_numpy(), texts.str.count(r"\S+").to_numpy()